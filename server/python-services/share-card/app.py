@@ -4,14 +4,26 @@ Flask microservice for generating share card images using Cairo+Pango
 """
 
 import os
-from flask import Flask, request, jsonify, send_file
+import json
+import hashlib
+import threading
+import time
+import zipfile
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Annotated, Literal, get_args
+import msgspec
+from flask import Flask, Response, request, jsonify
 from io import BytesIO
 import traceback
 
 # Import template modules
-from templates.base_template import render_test_card
-from templates.erg_summary import render_erg_summary
-from templates.erg_summary_alt import render_erg_summary_alt
+from templates.constants import DIMENSIONS
+from templates.base_template import render_test_card, warm_up_fonts
+from templates.erg_summary import render_erg_summary, pin_default_layers as pin_summary_layers
+from templates.erg_summary_alt import render_erg_summary_alt, pin_default_layers as pin_summary_alt_layers
 from templates.regatta_result import render_regatta_result
 from templates.regatta_summary import render_regatta_summary
 from templates.season_recap import render_season_recap
@@ -19,12 +31,6 @@ from templates.team_leaderboard import render_team_leaderboard
 
 app = Flask(__name__)
 
-# Supported card dimensions (width, height) at 2160px base
-DIMENSIONS = {
-    '1:1': (2160, 2160),      # Instagram square
-    '9:16': (2160, 3840),     # Instagram/TikTok story
-}
-
 # Card renderer registry - maps cardType to renderer function
 CARD_RENDERERS = {
     'test': render_test_card,
@@ -36,6 +42,322 @@ CARD_RENDERERS = {
     'team_leaderboard': render_team_leaderboard,  # Team rankings snapshot
 }
 
+# Rendered PNG cache - identical requests (link previews, retries, multiple
+# platforms) are served without re-rendering. ~2 MB per entry at 2160px.
+# The memory tier is per gunicorn worker (filled after fork, not shared), so the
+# total is GUNICORN_WORKERS x CARD_CACHE_SIZE x ~2 MB - ~64 MB per worker by
+# default. Set CARD_CACHE_DIR for a larger cache shared by all workers.
+CARD_CACHE_SIZE = int(os.environ.get('CARD_CACHE_SIZE', '32'))
+_card_cache = OrderedDict()
+_card_cache_lock = threading.Lock()
+
+# Optional on-disk second tier, shared by all workers and kept across restarts.
+# Capped at CARD_CACHE_DIR_MAX_MB: least recently used files are swept out
+# (see sweep_card_cache_dir). Files from an older template version are never
+# hit again (RENDER_VERSION is part of the key), so they age out the same way.
+CARD_CACHE_DIR = os.environ.get('CARD_CACHE_DIR')
+CARD_CACHE_DIR_MAX_MB = int(os.environ.get('CARD_CACHE_DIR_MAX_MB', '1024'))
+CARD_CACHE_SWEEP_EVERY = 64  # Disk writes between size checks, per worker
+_card_cache_writes = 0
+
+
+def _render_version():
+    """Digest of the template sources, so a deploy that changes a template gets new cache keys"""
+    templates_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(templates_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(templates_dir, name), 'rb') as f:
+                digest.update(name.encode('utf-8'))
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+RENDER_VERSION = _render_version()
+
+
+def card_cache_key(card_type, format_key, workout_data, options):
+    """SHA-256 of the canonical JSON form of everything that affects the render"""
+    payload = json.dumps(
+        {'v': RENDER_VERSION, 't': card_type, 'f': format_key, 'w': workout_data, 'o': options},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).digest()
+
+
+def _card_cache_path(key):
+    return os.path.join(CARD_CACHE_DIR, key.hex() + '.png')
+
+
+def sweep_card_cache_dir():
+    """
+    Bound CARD_CACHE_DIR to CARD_CACHE_DIR_MAX_MB
+
+    Deletes the least recently used PNGs (hits refresh a file's mtime) until
+    the directory is back under 90% of the cap, and temp files left behind by
+    a write that never finished. Safe to run from several workers at once.
+    """
+    now = time.time()
+    entries = []
+    total = 0
+    with os.scandir(CARD_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # Removed by another worker's sweep
+            if entry.name.endswith('.tmp'):
+                if now - st.st_mtime > 3600:
+                    _remove_quietly(entry.path)
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+    limit = CARD_CACHE_DIR_MAX_MB * 1024 * 1024
+    if total <= limit:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        if total <= limit * 0.9:
+            break
+        _remove_quietly(path)
+        total -= size
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+if CARD_CACHE_DIR:
+    os.makedirs(CARD_CACHE_DIR, exist_ok=True)
+    sweep_card_cache_dir()
+
+
+def card_cache_get(key):
+    """Return cached PNG bytes (marking them most recently used) or None"""
+    with _card_cache_lock:
+        png_bytes = _card_cache.get(key)
+        if png_bytes is not None:
+            _card_cache.move_to_end(key)
+            return png_bytes
+
+    if CARD_CACHE_DIR:
+        path = _card_cache_path(key)
+        try:
+            with open(path, 'rb') as f:
+                png_bytes = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for sweep_card_cache_dir
+        except OSError:
+            pass  # Swept meanwhile - the bytes read are still good
+        _card_cache_store(key, png_bytes)
+    return png_bytes
+
+
+def _card_cache_store(key, png_bytes):
+    if CARD_CACHE_SIZE <= 0:
+        return
+    with _card_cache_lock:
+        _card_cache[key] = png_bytes
+        _card_cache.move_to_end(key)
+        while len(_card_cache) > CARD_CACHE_SIZE:
+            _card_cache.popitem(last=False)
+
+
+def card_cache_put(key, png_bytes):
+    """Store PNG bytes, evicting least recently used entries over CARD_CACHE_SIZE"""
+    global _card_cache_writes
+    _card_cache_store(key, png_bytes)
+
+    if CARD_CACHE_DIR:
+        # Write-then-rename so concurrent readers never see a partial file
+        path = _card_cache_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(png_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            app.logger.warning(f"Card cache write failed: {e}")
+            return
+
+        with _card_cache_lock:
+            _card_cache_writes += 1
+            sweep = _card_cache_writes % CARD_CACHE_SWEEP_EVERY == 0
+        if sweep:
+            try:
+                sweep_card_cache_dir()
+            except OSError as e:
+                app.logger.warning(f"Card cache sweep failed: {e}")
+
+
+# Batch rendering pool - created lazily per worker so gunicorn's fork happens
+# before any pool processes exist. 'fork' lets pool processes inherit the
+# already-imported templates and loaded font map copy-on-write.
+# Every gunicorn worker has its own pool, so the default splits the CPUs
+# between them (same worker count default as gunicorn_conf.py). With the
+# default 2*CPU+1 workers every core is already busy with requests, so that
+# is 1 and batches render serially in the worker itself (see render_batch):
+# a per-worker pool of CPU processes would oversubscribe the cores CPU times
+# over and give every pool process its own surfaces and layer caches.
+# Deployments that mostly serve batches get real batch parallelism by running
+# fewer GUNICORN_WORKERS (or setting BATCH_WORKERS).
+_cpu_count = os.cpu_count() or 1
+_server_workers = int(os.environ.get('GUNICORN_WORKERS', str(2 * _cpu_count + 1)))
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', str(max(1, _cpu_count // _server_workers))))
+MAX_BATCH_SIZE = 32
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+def _warm_up():
+    """
+    Pay one-time start-up costs at import: Pango font map loading, glyph
+    shaping/rasterization caches, the grain tile and first-use caches.
+    Under gunicorn --preload this runs once in the master and every worker
+    inherits the warm state copy-on-write. Nothing here may start threads that
+    a forked child would need; smoke_test_preload.py checks the forked setup
+    end to end.
+
+    The default-scale Design A/B layers are pinned here (~52 MB per design,
+    1:1 + 9:16) so workers share them instead of each rendering its own.
+    What a worker still allocates privately, at most:
+    - render surfaces: SURFACE_POOL_SIZE per thread, ~52 MB at full scale
+    - PNG cache: CARD_CACHE_SIZE x ~2 MB, ~64 MB
+    - non-default layers (other quality / thumb fidelity): 2 Design B, 1 Design A
+      and 1 test card entry, each <= 33 MB (9:16 at full scale; 15 MB at medium)
+    """
+    warm_up_fonts()
+    pin_summary_layers()
+    pin_summary_alt_layers()
+    render_test_card('1:1', None, {})
+
+
+_warm_up()
+
+
+def _get_batch_pool():
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            mp_context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            _batch_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS, mp_context=mp_context)
+        return _batch_pool
+
+
+def _discard_batch_pool(pool):
+    """Drop a broken pool so the next batch starts a fresh one"""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is pool:
+            _batch_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def render_batch(jobs):
+    """
+    Render (card_type, format_key, workout_data, options) jobs in the batch pool
+
+    With a single pool process (or a single job) the pool would only add
+    pickling and IPC to a serial render, so the jobs are rendered in this
+    worker instead and no pool is started.
+
+    A pool process that dies (OOM kill, crash) breaks the whole pool - it is
+    replaced and the batch retried once, instead of failing every later batch.
+
+    Returns: List of PNG bytes, in job order
+    """
+    if BATCH_WORKERS <= 1 or len(jobs) == 1:
+        return [_render_card(*job) for job in jobs]
+
+    for attempt in range(2):
+        pool = _get_batch_pool()
+        try:
+            futures = [pool.submit(_render_card, *job) for job in jobs]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_batch_pool(pool)
+            if attempt:
+                raise
+            app.logger.warning("Batch pool broke, restarting it")
+
+
+def _render_card(card_type, format_key, workout_data, options):
+    """Render one card (in a pool process, the renderer is looked up by name so the job pickles)"""
+    return CARD_RENDERERS[card_type](format_key, workout_data, options)
+
+
+# Spelled out so type checkers can read it; must list exactly the DIMENSIONS keys
+CardFormat = Literal['1:1', '9:16']
+if set(get_args(CardFormat)) != set(DIMENSIONS):
+    raise RuntimeError(f"CardFormat {get_args(CardFormat)} does not match DIMENSIONS {tuple(DIMENSIONS)}")
+
+
+class CardOptions(msgspec.Struct, frozen=True):
+    """
+    Render options the templates read, type-checked so a bad value is a 400
+    instead of a failed render. Other keys are dropped; unset ones stay unset,
+    so each template applies its own default.
+    """
+    showAttribution: bool | msgspec.UnsetType = msgspec.UNSET
+    showName: bool | msgspec.UnsetType = msgspec.UNSET
+    athleteName: str | msgspec.UnsetType = msgspec.UNSET
+    teamColor: str | None | msgspec.UnsetType = msgspec.UNSET
+    quality: str | msgspec.UnsetType = msgspec.UNSET
+    pngLevel: Annotated[int, msgspec.Meta(ge=0, le=9)] | msgspec.UnsetType = msgspec.UNSET
+    fidelity: str | msgspec.UnsetType = msgspec.UNSET
+    cacheBypass: bool | msgspec.UnsetType = msgspec.UNSET
+
+    def to_dict(self):
+        """Plain dict of the options that were given, as the renderers take them"""
+        return msgspec.to_builtins(self)
+
+
+class CardRequest(msgspec.Struct):
+    """/generate request body, decoded and type-checked in a single pass"""
+    cardType: Annotated[str, msgspec.Meta(min_length=1)]
+    format: CardFormat = '1:1'
+    workoutData: dict = {}
+    options: CardOptions = CardOptions()
+
+
+class BatchCardRequest(msgspec.Struct):
+    """/generate_batch request body"""
+    cards: Annotated[list[CardRequest], msgspec.Meta(min_length=1, max_length=MAX_BATCH_SIZE)]
+
+
+def decode_request(body, request_type):
+    """
+    Decode and validate a raw JSON request body
+
+    Returns: (request_type instance, None) on success,
+             (None, (error_json, status)) on a malformed or invalid body
+    """
+    if not body:
+        return None, ({"error": "Missing request body"}, 400)
+    try:
+        return msgspec.json.decode(body, type=request_type), None
+    except msgspec.ValidationError as e:
+        return None, ({"error": f"Invalid request: {e}"}, 400)
+    except msgspec.DecodeError:
+        return None, ({"error": "Malformed JSON request body"}, 400)
+
+
+def check_card_type(card):
+    """Return (error_json, status) if no renderer exists for the card type, else None"""
+    if card.cardType not in CARD_RENDERERS:
+        return {
+            "error": f"Unknown card type: {card.cardType}",
+            "supported": list(CARD_RENDERERS.keys())
+        }, 400
+    return None
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -53,52 +375,55 @@ def generate_card():
         "cardType": "workout-summary" | "interval-grid" | "splits-table" | ...,
         "format": "1:1" | "9:16",
         "workoutData": { ... },  # Workout data from Express backend
-        "options": {
+        "options": {   # All optional, see CardOptions; other keys are ignored
             "showAttribution": true,
+            "showName": true,
+            "athleteName": "...",
             "teamColor": "#B87333",
-            ...
+            "quality": "high" | "medium" | "low",   # Output scale 1.0 / 0.67 / 0.5
+            "pngLevel": 1,   # zlib level 0-9 (higher = smaller, slower)
+            "fidelity": "full" | "medium" | "thumb",   # erg_summary_alt previews, others render full
+            "cacheBypass": false   # Force a fresh render
         }
     }
 
     Returns: PNG image binary (Content-Type: image/png)
+    X-Cache response header reports HIT or MISS against the PNG cache
     """
     try:
-        # Parse request body
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "Missing request body"}), 400
-
-        card_type = data.get('cardType')
-        format_key = data.get('format', '1:1')
-        workout_data = data.get('workoutData', {})
-        options = data.get('options', {})
-
-        # Validate required fields
-        if not card_type:
-            return jsonify({"error": "Missing required field: cardType"}), 400
-
-        if format_key not in DIMENSIONS:
-            return jsonify({"error": f"Invalid format: {format_key}. Supported: {list(DIMENSIONS.keys())}"}), 400
-
-        # Get renderer for card type
-        renderer = CARD_RENDERERS.get(card_type)
-        if not renderer:
-            return jsonify({
-                "error": f"Unknown card type: {card_type}",
-                "supported": list(CARD_RENDERERS.keys())
-            }), 400
-
-        # Render card to PNG bytes
-        # Renderers accept (format_key, workout_data, options) and return bytes
-        png_bytes = renderer(format_key, workout_data, options)
-
-        # Return PNG binary
-        return send_file(
-            BytesIO(png_bytes),
-            mimetype='image/png',
-            as_attachment=False,
-            download_name=f'{card_type}-{format_key.replace(":", "x")}.png'
-        )
+        # Parse and validate request body
+        card, error = decode_request(request.get_data(), CardRequest)
+        if error is None:
+            error = check_card_type(card)
+        if error:
+            body, status = error
+            return jsonify(body), status
+
+        card_type = card.cardType
+        format_key = card.format
+        workout_data = card.workoutData
+        options = card.options.to_dict()
+        renderer = CARD_RENDERERS[card_type]
+
+        # Serve identical requests from the PNG cache
+        use_cache = not options.get('cacheBypass', False)
+        cache_key = card_cache_key(card_type, format_key, workout_data, options)
+        png_bytes = card_cache_get(cache_key) if use_cache else None
+        cache_status = 'HIT' if png_bytes is not None else 'MISS'
+
+        if png_bytes is None:
+            # Render card to PNG bytes
+            # Renderers accept (format_key, workout_data, options) and return bytes
+            png_bytes = renderer(format_key, workout_data, options)
+            if use_cache:
+                card_cache_put(cache_key, png_bytes)
+
+        # Return PNG binary (bytes go straight to the WSGI server, no BytesIO copy)
+        filename = f'{card_type}-{format_key.replace(":", "x")}.png'
+        return Response(png_bytes, mimetype='image/png', headers={
+            'Content-Disposition': f'inline; filename="{filename}"',
+            'X-Cache': cache_status,
+        })
 
     except Exception as e:
         # Log error with stack trace in dev mode
@@ -111,6 +436,76 @@ def generate_card():
         }), 500
 
 
+@app.route('/generate_batch', methods=['POST'])
+def generate_card_batch():
+    """
+    Generate several share cards in parallel
+
+    Request body:
+    {
+        "cards": [ { <same shape as /generate> }, ... ]   # Up to MAX_BATCH_SIZE
+    }
+
+    Cards render in parallel in the batch pool when BATCH_WORKERS > 1, else
+    one after another in this worker. Cached cards are served without rendering.
+
+    Returns: ZIP archive of PNGs named NN-<cardType>-<format>.png, in request order
+    """
+    try:
+        batch, error = decode_request(request.get_data(), BatchCardRequest)
+        if error:
+            body, status = error
+            return jsonify(body), status
+
+        cards = []
+        for i, card in enumerate(batch.cards):
+            error = check_card_type(card)
+            if error:
+                body, status = error
+                body['index'] = i
+                return jsonify(body), status
+            cards.append((card.cardType, card.format, card.workoutData, card.options.to_dict()))
+
+        # Look up cached cards, dispatch the rest to the pool
+        results = [None] * len(cards)
+        misses = []
+        for i, card in enumerate(cards):
+            options = card[3]
+            use_cache = not options.get('cacheBypass', False)
+            cache_key = card_cache_key(*card)
+            if use_cache:
+                results[i] = card_cache_get(cache_key)
+            if results[i] is None:
+                misses.append((i, cache_key, use_cache))
+
+        if misses:
+            rendered = render_batch([cards[i] for i, _, _ in misses])
+            for (i, cache_key, use_cache), png_bytes in zip(misses, rendered):
+                results[i] = png_bytes
+                if use_cache:
+                    card_cache_put(cache_key, png_bytes)
+
+        # PNGs are already compressed, so store them as-is
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+            for i, ((card_type, format_key, _, _), png_bytes) in enumerate(zip(cards, results)):
+                zf.writestr(f'{i:02d}-{card_type}-{format_key.replace(":", "x")}.png', png_bytes)
+
+        return Response(archive.getvalue(), mimetype='application/zip', headers={
+            'Content-Disposition': 'attachment; filename="share-cards.zip"',
+            'X-Cache-Hits': str(len(cards) - len(misses)),
+        })
+
+    except Exception as e:
+        error_detail = traceback.format_exc() if app.debug else str(e)
+        app.logger.error(f"Batch card generation failed: {error_detail}")
+
+        return jsonify({
+            "error": "Batch card generation failed",
+            "detail": str(e) if app.debug else "Internal server error"
+        }), 500
+
+
 if __name__ == '__main__':
-    # Development server (use gunicorn in production via Dockerfile)
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only - production runs gunicorn with gunicorn_conf.py
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get('FLASK_DEBUG') == '1')
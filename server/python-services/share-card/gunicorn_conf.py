@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for the share card service
+
+preload_app imports app.py (templates, Pango font map, grain tile, warm-up
+render) once in the master; workers inherit it copy-on-write instead
+of each paying the start-up cost on their first request.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', str(2 * multiprocessing.cpu_count() + 1)))
+worker_class = 'sync'
+timeout = 120
+preload_app = True
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Smoke test for the production server setup: starts gunicorn with
+gunicorn_conf.py (preload_app, so the font and cache warm-up run in the
+master before workers fork) and renders cards from the forked workers
+
+Usage: python smoke_test_preload.py   (run from this directory, gunicorn installed)
+Exits non-zero if any request fails or a worker dies.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import zipfile
+from io import BytesIO
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+SAMPLE_WORKOUT = {
+    'workoutType': 'FixedDistanceInterval',
+    'rawMachineType': 'rower',
+    'date': '2026-02-10T09:30:00Z',
+    'distanceM': 8000,
+    'durationSeconds': 1835,
+    'avgPaceTenths': 1147,
+    'avgWatts': 232,
+    'avgHeartRate': 171,
+    'strokeRate': 26,
+    'splits': [
+        {'splitNumber': i + 1, 'distanceM': 2000, 'timeSeconds': 458.8 + i,
+         'paceTenths': 1147 + i * 3, 'watts': 232 - i * 4, 'strokeRate': 26,
+         'heartRate': 165 + i * 3, 'restTime': 1200, 'heartRateRest': 120}
+        for i in range(4)
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def post(base_url, path, payload):
+    req = urllib.request.Request(
+        base_url + path, data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        return resp.status, dict(resp.headers), resp.read()
+
+
+def wait_healthy(base_url, server, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited during start-up (rc {server.returncode})")
+        try:
+            with urllib.request.urlopen(base_url + '/health', timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("gunicorn did not become healthy")
+
+
+def run_checks(base_url):
+    card = {'cardType': 'erg_summary_alt', 'format': '1:1',
+            'workoutData': SAMPLE_WORKOUT, 'options': {}}
+
+    # Several requests so every worker renders at least once
+    for i in range(6):
+        status, headers, body = post(base_url, '/generate', dict(card, format=('1:1', '9:16')[i % 2]))
+        assert status == 200 and body.startswith(PNG_SIGNATURE), f"/generate #{i} failed"
+
+    status, headers, body = post(base_url, '/generate', card)
+    assert headers.get('X-Cache') == 'HIT', "repeated /generate was not a cache hit"
+
+    # Batch renders fork pool processes from a worker - run twice so a broken
+    # pool from the first call would show up
+    batch = {'cards': [dict(card, options={'cacheBypass': True}),
+                       dict(card, format='9:16', options={'cacheBypass': True}),
+                       {'cardType': 'test', 'format': '1:1', 'options': {'cacheBypass': True}}]}
+    for attempt in range(2):
+        status, headers, body = post(base_url, '/generate_batch', batch)
+        assert status == 200, f"/generate_batch attempt {attempt} failed"
+        with zipfile.ZipFile(BytesIO(body)) as zf:
+            names = zf.namelist()
+            assert len(names) == 3, f"expected 3 cards, got {names}"
+            assert all(zf.read(n).startswith(PNG_SIGNATURE) for n in names)
+
+
+def main():
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    # The disk cache tier is shared by the workers, so a repeat is a HIT whichever
+    # worker serves it; the server log goes to a file so it can never block
+    with tempfile.TemporaryDirectory() as cache_dir, tempfile.TemporaryFile(mode='w+') as log:
+        # BATCH_WORKERS > 1 so batches go through the forked pool on any host
+        env = dict(os.environ, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS='2',
+                   BATCH_WORKERS='2', CARD_CACHE_DIR=cache_dir)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_conf.py', 'app:app'],
+            env=env, stderr=log, text=True
+        )
+        try:
+            wait_healthy(base_url, server)
+            run_checks(base_url)
+            assert server.poll() is None, "gunicorn master died"
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            log.seek(0)
+            stderr = log.read()
+
+    # A worker killed by a fork-unsafe runtime is respawned by the master, so
+    # the requests above can pass - check the log as well
+    fatal = [line for line in stderr.splitlines()
+             if ('Worker' in line and ('exited' in line or 'was sent' in line))
+             or 'Terminating' in line or 'BrokenProcessPool' in line]
+    if fatal:
+        print('\n'.join(fatal))
+        sys.exit(1)
+    print("Preloaded gunicorn smoke test passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,26 +4,56 @@ Provides reusable Cairo+Pango drawing functions for all card templates
 """
 
 import os
+import sys
+import math
+import threading
+from functools import lru_cache, wraps
 import cairocffi as cairo
 import pangocairocffi as pango
+from pangocffi import pango as pango_lib, FontDescription, TabArray, TabAlign
+import numpy as np
+from PIL import Image
 from io import BytesIO
-import random
-
-# Color constants - Canvas design system colors
-DARK_BG = (0.03, 0.03, 0.04)  # #08080a
-COPPER = (0.72, 0.45, 0.20)   # #B87333
-GOLD = (0.83, 0.65, 0.29)     # #D4A54A
-ROSE = (0.79, 0.48, 0.48)     # #C97B7B
-TEXT_PRIMARY = (1.0, 1.0, 1.0)      # white
-TEXT_SECONDARY = (0.62, 0.63, 0.68) # #9FA0AD
-TEXT_MUTED = (0.35, 0.36, 0.42)     # #5A5B6A
-TEAL = (0.30, 0.70, 0.65)           # for stroke rate column
-WARM_WHITE = (0.95, 0.93, 0.88)     # for subtle warm text
-AMBER = (0.85, 0.65, 0.20)          # for accent highlights
-SLATE = (0.25, 0.27, 0.30)          # for subtle backgrounds
-DEEP_COPPER = (0.55, 0.35, 0.15)    # for darker accents
 
+from templates.grain import make_grain
 
+# Constants re-exported for templates that import them from here
+from templates.constants import (  # noqa: F401
+    DIMENSIONS, DARK_BG, COPPER, GOLD, ROSE, TEXT_PRIMARY, TEXT_SECONDARY,
+    TEXT_MUTED, TEAL, WARM_WHITE, AMBER, SLATE, DEEP_COPPER
+)
+
+PANGO_SCALE = 1024  # Pango uses 1/1024th of a point
+
+# Arc angles for rounded corners
+_PI = math.pi
+_PI_HALF = math.pi / 2
+_PI_ONE_HALF = 3 * math.pi / 2
+
+# Render scale relative to the 2160px layout grid. Templates always draw in
+# 2160px coordinates; the surface is allocated smaller and the context scaled.
+DEFAULT_RENDER_SCALE = float(os.environ.get('OARBIT_RENDER_SCALE', '1.0'))
+QUALITY_SCALES = {
+    'high': 1.0,
+    'medium': 0.67,
+    'low': 0.5,
+}
+
+# Render surfaces are reused per thread instead of allocating (and zeroing)
+# a 18-33 MB buffer per request. One entry per format at the common scale.
+SURFACE_POOL_SIZE = 2
+_surface_pool = threading.local()
+
+# Grain noise is generated as a square tile of this size and repeated.
+# Must stay a multiple of the grain block size (4) so the tile edges line up.
+GRAIN_TILE_SIZE = 256
+
+# zlib level for PNG output - cards are re-encoded by social platforms anyway,
+# so encode speed matters far more than file size
+PNG_COMPRESS_LEVEL = 1
+
+
+@lru_cache(maxsize=64)
 def hex_to_rgb(hex_color):
     """Convert hex color (#RRGGBB or RRGGBB) to RGB tuple (0-1 range)"""
     hex_color = hex_color.lstrip('#')
@@ -39,47 +69,167 @@ def get_font_path(font_file):
     return os.path.join(script_dir, 'fonts', font_file)
 
 
-def setup_canvas(width, height):
+def render_scale(options):
+    """
+    Resolve the render scale for a request
+
+    Args:
+        options: Dict with optional 'quality' ('high', 'medium', 'low')
+
+    Returns: Scale factor, OARBIT_RENDER_SCALE when quality is not given
+    """
+    quality = (options or {}).get('quality')
+    return QUALITY_SCALES.get(quality, DEFAULT_RENDER_SCALE)
+
+
+def setup_canvas(width, height, scale=1.0):
     """
     Create Cairo surface and context
 
+    Surfaces come from a small per-thread pool and are NOT cleared - every
+    template must start by filling the full frame with an opaque background.
+
+    Args:
+        width, height: Layout size in 2160px-grid coordinates
+        scale: Output scale - the surface is width*scale x height*scale
+               and the context is scaled so drawing code is unchanged
+
     Returns: (surface, ctx)
     """
-    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    size = (round(width * scale), round(height * scale))
+    pool = getattr(_surface_pool, 'surfaces', None)
+    if pool is None:
+        pool = _surface_pool.surfaces = {}
+
+    surface = pool.get(size)
+    if surface is None:
+        if len(pool) >= SURFACE_POOL_SIZE:
+            pool.pop(next(iter(pool)))  # Drop the oldest size
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *size)
+        pool[size] = surface
+
     ctx = cairo.Context(surface)
+    if scale != 1.0:
+        ctx.scale(scale, scale)
     return surface, ctx
 
 
-def draw_background(ctx, width, height, color=DARK_BG):
-    """Fill background with solid color"""
-    ctx.set_source_rgb(*color)
-    ctx.rectangle(0, 0, width, height)
-    ctx.fill()
+def create_layer(width, height, scale=1.0):
+    """
+    Create an unpooled surface and context for a cached, pre-rendered layer
 
+    Same sizing and scaling as setup_canvas, but the surface is freshly
+    allocated (transparent) and owned by the caller.
 
-def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weight='Regular', align='left'):
+    Returns: (surface, ctx)
     """
-    Draw text using Pango with font loading and alignment
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, round(width * scale), round(height * scale))
+    ctx = cairo.Context(surface)
+    if scale != 1.0:
+        ctx.scale(scale, scale)
+    return surface, ctx
 
-    Args:
-        ctx: Cairo context
-        text: Text to render
-        font_family: 'IBM Plex Sans' or 'IBM Plex Mono'
-        font_size: Size in pixels (at 2160px resolution)
-        x, y: Position (top-left for align='left')
-        color: RGB tuple (0-1 range)
-        weight: 'Regular', 'SemiBold', 'Bold'
-        align: 'left', 'center', 'right'
 
-    Returns: (text_width, text_height) for layout calculations
+def layer_cache(maxsize):
     """
-    # Create Pango layout
-    layout = pango.create_layout(ctx)
+    Cache decorator for pre-rendered full-frame layers
+
+    Each entry is an ARGB32 surface at output size (~19 MB for 1:1 and ~33 MB
+    for 9:16 at full scale), so two tiers keep this bounded per worker:
+    - layer.pin(*args) renders a key and keeps it for good. app.py pins the
+      default-scale layers while preloading, so every forked worker shares
+      those pages copy-on-write (layers are never written after flush).
+    - Any other key (a quality / fidelity variant) goes through a per-worker
+      LRU of maxsize entries.
+    """
+    def decorator(render):
+        cached = lru_cache(maxsize=maxsize)(render)
+        pinned = {}
+
+        @wraps(render)
+        def layer(*args):
+            surface = pinned.get(args)
+            if surface is None:
+                surface = cached(*args)
+            return surface
+
+        def pin(*args):
+            if args not in pinned:
+                pinned[args] = render(*args)
+
+        layer.pin = pin
+        layer.cache_info = cached.cache_info
+        return layer
+    return decorator
+
+
+def blit_surface(ctx, source, x=0, y=0):
+    """Paint a pre-rendered surface 1:1 in device pixels, ignoring ctx scale
+
+    x, y: Device-pixel offset of the surface's top-left corner
+    """
+    ctx.save()
+    ctx.identity_matrix()
+    ctx.set_source_surface(source, x, y)
+    ctx.paint()
+    ctx.restore()
 
-    # Map font family and weight to font description
-    # Pango uses point sizes, convert from pixels (assuming 96 DPI)
-    font_pt = int(font_size * 0.75)
 
+@lru_cache(maxsize=128)
+def solid_pattern(color, alpha=1.0):
+    """
+    Shared SolidPattern per RGB tuple (0-1 range) and alpha
+
+    Drawing helpers set these with ctx.set_source instead of set_source_rgb(a),
+    so repeated palette colors reuse one pattern instead of creating one per call.
+    """
+    return cairo.SolidPattern(*color, alpha)
+
+
+# Palette patterns are created at import (and inherited by preloaded workers)
+for _color in (DARK_BG, COPPER, GOLD, ROSE, TEXT_PRIMARY, TEXT_SECONDARY,
+               TEXT_MUTED, TEAL, WARM_WHITE, AMBER, SLATE, DEEP_COPPER):
+    solid_pattern(_color)
+del _color
+
+
+def pack_argb32(color):
+    """Pack an opaque RGB tuple (0-1 range) into a native ARGB32 pixel word"""
+    r, g, b = (round(c * 255) for c in color)
+    return np.uint32(0xFF000000 | (r << 16) | (g << 8) | b)
+
+
+def draw_background(ctx, width, height, color=DARK_BG):
+    """
+    Fill background with solid color
+
+    When the fill covers the whole target image, the pixel buffer is filled
+    directly with the packed color word (a vectorized memset) rather than
+    through Cairo's path fill.
+    """
+    target = ctx.get_target()
+    if isinstance(target, cairo.ImageSurface) and target.get_format() == cairo.FORMAT_ARGB32:
+        x0, y0 = ctx.user_to_device(0, 0)
+        x1, y1 = ctx.user_to_device(width, height)
+        if x0 <= 0 and y0 <= 0 and x1 >= target.get_width() and y1 >= target.get_height():
+            target.flush()
+            np.frombuffer(target.get_data(), dtype=np.uint32).fill(pack_argb32(color))
+            target.mark_dirty()
+            return
+
+    ctx.set_source(solid_pattern(color))
+    ctx.rectangle(0, 0, width, height)
+    ctx.fill()
+
+
+@lru_cache(maxsize=64)
+def get_font_description(font_family, weight, font_pt):
+    """
+    Parse a Pango font description once per (family, weight, size)
+
+    FontDescription owns the parsed pointer and frees it when collected,
+    so cached entries live for the worker's lifetime and evictions are freed.
+    """
     # Build font description
     # For now, use system fonts that Pango can find
     # In Docker, fonts will be registered via fc-cache
@@ -89,19 +239,60 @@ def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weigh
         font_desc_str = f"IBM Plex Sans {weight} {font_pt}"
 
     # Use pangocffi low-level API to create font description from string
-    from pangocffi import pango as pango_lib, FontDescription
     font_desc_ptr = pango_lib.pango_font_description_from_string(font_desc_str.encode('utf-8'))
-    font_desc = FontDescription(font_desc_ptr)
-    layout._set_font_description(font_desc)
+    return FontDescription(font_desc_ptr)
+
+
+def get_layout(ctx, text, font_family, font_size, weight='Regular'):
+    """
+    Prepare the context's shared Pango layout for a piece of text
+
+    One layout is created per Cairo context and reused by every text call,
+    only swapping its text - and its font description when the style differs
+    from the previous call, so consecutive same-style calls skip the font
+    change (and the font reload Pango does on it).
 
-    # Set text
+    Returns: (layout, text_width, text_height)
+    """
+    layout = getattr(ctx, '_oarbit_layout', None)
+    if layout is None:
+        layout = pango.create_layout(ctx)
+        ctx._oarbit_layout = layout
+        ctx._oarbit_font = None
+    else:
+        # Pick up any transformation change since the layout was created
+        pango.update_layout(ctx, layout)
+
+    # Pango uses point sizes, convert from pixels (assuming 96 DPI)
+    font_pt = int(font_size * 0.75)
+    font = (font_family, weight, font_pt)
+    if font != ctx._oarbit_font:
+        layout._set_font_description(get_font_description(*font))
+        ctx._oarbit_font = font
     layout._set_text(text)
 
     # Get text dimensions (get_size returns logical size, divide by PANGO_SCALE for pixels)
     width_units, height_units = layout.get_size()
-    PANGO_SCALE = 1024  # Pango uses 1/1024th of a point
-    text_width = width_units / PANGO_SCALE
-    text_height = height_units / PANGO_SCALE
+    return layout, width_units / PANGO_SCALE, height_units / PANGO_SCALE
+
+
+def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weight='Regular', align='left'):
+    """
+    Draw text using Pango with font loading and alignment
+
+    Args:
+        ctx: Cairo context
+        text: Text to render
+        font_family: 'IBM Plex Sans' or 'IBM Plex Mono'
+        font_size: Size in pixels (at 2160px resolution)
+        x, y: Position (top-left for align='left')
+        color: RGB tuple (0-1 range)
+        weight: 'Regular', 'SemiBold', 'Bold'
+        align: 'left', 'center', 'right'
+
+    Returns: (text_width, text_height) for layout calculations
+    """
+    layout, text_width, text_height = get_layout(ctx, text, font_family, font_size, weight)
 
     # Apply alignment offset
     if align == 'center':
@@ -110,13 +301,72 @@ def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weigh
         x = x - text_width
 
     # Move to position and draw
-    ctx.set_source_rgb(*color)
+    ctx.set_source(solid_pattern(color))
     ctx.move_to(x, y)
     pango.show_layout(ctx, layout)
 
     return text_width, text_height
 
 
+def draw_text_columns(ctx, rows, font_family, font_size, col_x, y, row_height,
+                      color=TEXT_PRIMARY, weight='Regular'):
+    """
+    Draw a left-aligned text table as a single tab-stopped Pango layout
+
+    One layout holds every row (newline-separated, cells tab-separated),
+    so the whole table is shaped and drawn in one show_layout call.
+
+    Args:
+        ctx: Cairo context
+        rows: Sequence of rows, each a sequence of cell strings (one per col_x)
+        font_family, font_size, color, weight: As for draw_text
+        col_x: Left edge x of each column
+        y: Top of the first row
+        row_height: Distance between the tops of consecutive rows
+
+    Returns: y of the row after the last one
+    """
+    if not rows:
+        return y
+
+    layout = pango.create_layout(ctx)
+    font_pt = int(font_size * 0.75)
+    layout._set_font_description(get_font_description(font_family, weight, font_pt))
+
+    # Tab stops are relative to the first column
+    tabs = TabArray()
+    tabs._set_tabs([
+        (TabAlign.LEFT, round((x - col_x[0]) * PANGO_SCALE)) for x in col_x[1:]
+    ])
+    layout._set_tabs(tabs)
+
+    # Measure one line, then pad with spacing so lines sit row_height apart
+    layout._set_text("\t".join(rows[0]))
+    _, line_units = layout.get_size()
+    layout._set_spacing(round(row_height * PANGO_SCALE) - line_units)
+
+    layout._set_text("\n".join("\t".join(row) for row in rows))
+    ctx.set_source(solid_pattern(color))
+    ctx.move_to(col_x[0], y)
+    pango.show_layout(ctx, layout)
+
+    return y + len(rows) * row_height
+
+
+@lru_cache(maxsize=64)
+def linear_gradient(x0, y0, x1, y1, color_start, color_end):
+    """
+    Shared two-stop LinearGradient per axis and color pair
+
+    Same sharing as solid_pattern: the pattern is immutable once its stops are
+    set, so each gradient bar / separator position builds it once.
+    """
+    gradient = cairo.LinearGradient(x0, y0, x1, y1)
+    gradient.add_color_stop_rgb(0, *color_start)
+    gradient.add_color_stop_rgb(1, *color_end)
+    return gradient
+
+
 def draw_gradient_rect(ctx, x, y, w, h, color_start, color_end, direction='vertical'):
     """
     Draw rectangle with linear gradient
@@ -125,12 +375,9 @@ def draw_gradient_rect(ctx, x, y, w, h, color_start, color_end, direction='verti
         direction: 'vertical' or 'horizontal'
     """
     if direction == 'vertical':
-        gradient = cairo.LinearGradient(x, y, x, y + h)
+        gradient = linear_gradient(x, y, x, y + h, color_start, color_end)
     else:
-        gradient = cairo.LinearGradient(x, y, x + w, y)
-
-    gradient.add_color_stop_rgb(0, *color_start)
-    gradient.add_color_stop_rgb(1, *color_end)
+        gradient = linear_gradient(x, y, x + w, y, color_start, color_end)
 
     ctx.set_source(gradient)
     ctx.rectangle(x, y, w, h)
@@ -145,10 +392,10 @@ def draw_rounded_rect(ctx, x, y, w, h, radius):
         radius: Corner radius in pixels
     """
     ctx.new_path()
-    ctx.arc(x + radius, y + radius, radius, 3.14159, 3.14159 * 1.5)
-    ctx.arc(x + w - radius, y + radius, radius, 3.14159 * 1.5, 0)
-    ctx.arc(x + w - radius, y + h - radius, radius, 0, 3.14159 * 0.5)
-    ctx.arc(x + radius, y + h - radius, radius, 3.14159 * 0.5, 3.14159)
+    ctx.arc(x + radius, y + radius, radius, _PI, _PI_ONE_HALF)
+    ctx.arc(x + w - radius, y + radius, radius, _PI_ONE_HALF, 0)
+    ctx.arc(x + w - radius, y + h - radius, radius, 0, _PI_HALF)
+    ctx.arc(x + radius, y + h - radius, radius, _PI_HALF, _PI)
     ctx.close_path()
 
 
@@ -163,45 +410,60 @@ def draw_panel(ctx, x, y, w, h, radius, bg_color, border_color=None):
     draw_rounded_rect(ctx, x, y, w, h, radius)
 
     # Fill background
-    ctx.set_source_rgb(*bg_color)
+    ctx.set_source(solid_pattern(bg_color))
     ctx.fill_preserve()
 
     # Draw border if specified
     if border_color:
-        ctx.set_source_rgb(*border_color)
+        ctx.set_source(solid_pattern(border_color))
         ctx.set_line_width(2)
         ctx.stroke()
 
 
 def draw_accent_stripe(ctx, x, y, w, h, color):
     """Draw accent stripe/highlight for team color injection"""
-    ctx.set_source_rgb(*color)
+    ctx.set_source(solid_pattern(color))
     ctx.rectangle(x, y, w, h)
     ctx.fill()
 
 
+@lru_cache(maxsize=8)
+def grain_mask(opacity):
+    """
+    Repeating grain mask per opacity, generated once and shared by every render
+
+    One GRAIN_TILE_SIZE tile of 4x4-block alpha (see templates.grain), wrapped
+    in an A8 ImageSurface and repeated across the frame. The tile is in device
+    pixels, so the same mask serves every render scale.
+    """
+    # Tile size is a multiple of 4, so A8 rows need no stride padding
+    alpha = make_grain(GRAIN_TILE_SIZE, GRAIN_TILE_SIZE, opacity)
+    # Surface keeps the array alive until it is released
+    tile = cairo.ImageSurface.create_for_data(
+        alpha, cairo.FORMAT_A8, GRAIN_TILE_SIZE, GRAIN_TILE_SIZE, GRAIN_TILE_SIZE
+    )
+    mask = cairo.SurfacePattern(tile)
+    mask.set_extend(cairo.EXTEND_REPEAT)
+    return mask
+
+
 def draw_grain_texture(ctx, width, height, opacity=0.03):
     """
     Draw subtle noise/grain overlay for premium feel
 
+    Solid white is composited through the cached grain_mask tile. At grain
+    opacity the repeat is not visible, and it avoids generating noise per render.
+    Grain size is the same at every scale.
+
     Args:
         opacity: Grain opacity (0-1), default 0.03 per user decision
     """
-    # Create noise pattern
-    grain_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
-    grain_ctx = cairo.Context(grain_surface)
-
-    # Generate random noise
-    for i in range(0, width, 4):
-        for j in range(0, height, 4):
-            noise = random.random() * opacity
-            grain_ctx.set_source_rgba(1, 1, 1, noise)
-            grain_ctx.rectangle(i, j, 4, 4)
-            grain_ctx.fill()
-
-    # Composite onto main context
-    ctx.set_source_surface(grain_surface, 0, 0)
-    ctx.paint()
+    # Composite white through the repeating mask, 1:1 in device pixels
+    ctx.save()
+    ctx.identity_matrix()
+    ctx.set_source(solid_pattern((1.0, 1.0, 1.0)))
+    ctx.mask(grain_mask(opacity))
+    ctx.restore()
 
 
 def draw_gradient_text(ctx, text, font_family, font_size, x, y, color_start, color_end):
@@ -219,32 +481,9 @@ def draw_gradient_text(ctx, text, font_family, font_size, x, y, color_start, col
 
     Returns: (text_width, text_height)
     """
-    # Create Pango layout
-    layout = pango.create_layout(ctx)
-    font_pt = int(font_size * 0.75)
-
-    if font_family == 'IBM Plex Mono':
-        font_desc_str = f"IBM Plex Mono Regular {font_pt}"
-    else:
-        font_desc_str = f"IBM Plex Sans Regular {font_pt}"
+    layout, text_width, text_height = get_layout(ctx, text, font_family, font_size)
 
-    from pangocffi import pango as pango_lib, FontDescription
-    font_desc_ptr = pango_lib.pango_font_description_from_string(font_desc_str.encode('utf-8'))
-    font_desc = FontDescription(font_desc_ptr)
-    layout._set_font_description(font_desc)
-    layout._set_text(text)
-
-    width_units, height_units = layout.get_size()
-    PANGO_SCALE = 1024
-    text_width = width_units / PANGO_SCALE
-    text_height = height_units / PANGO_SCALE
-
-    # Create gradient
-    gradient = cairo.LinearGradient(x, y, x + text_width, y)
-    gradient.add_color_stop_rgb(0, *color_start)
-    gradient.add_color_stop_rgb(1, *color_end)
-
-    ctx.set_source(gradient)
+    ctx.set_source(linear_gradient(x, y, x + text_width, y, color_start, color_end))
     ctx.move_to(x, y)
     pango.show_layout(ctx, layout)
 
@@ -262,7 +501,7 @@ def draw_horizontal_rule(ctx, x, y, width, color, thickness=2):
         color: RGB tuple
         thickness: Line thickness in pixels (default 2)
     """
-    ctx.set_source_rgb(*color)
+    ctx.set_source(solid_pattern(color))
     ctx.rectangle(x, y, width, thickness)
     ctx.fill()
 
@@ -299,39 +538,92 @@ def draw_oarbit_branding(ctx, width, height, format_key, options):
     )
 
 
-def surface_to_png_bytes(surface):
-    """Write Cairo surface to PNG bytes"""
-    buffer = BytesIO()
-    surface.write_to_png(buffer)
-    return buffer.getvalue()
+# Characters the templates draw: digits, letters, units and punctuation
+WARM_UP_GLYPHS = (
+    "0123456789 ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz "
+    ":.,/#+-~'\"()%|\u2193\u2191\u2192"
+)
+WARM_UP_FAMILIES = ('IBM Plex Sans', 'IBM Plex Mono')
+WARM_UP_WEIGHTS = ('Regular', 'SemiBold', 'Bold')
+WARM_UP_SIZES = (28, 32, 36, 40, 52, 72)  # Most common label/value sizes
 
+# Numeric cells are Mono at sizes fitted per table (44-54px) plus stat values
+WARM_UP_NUMBER_GLYPHS = "0123456789:.,/-' Km"
+WARM_UP_NUMBER_SIZES = tuple(range(44, 55)) + (64,)
 
-def render_test_card(format_key, workout_data=None, options=None):
+
+def warm_up_fonts():
     """
-    Render a test card to verify the rendering pipeline
+    Shape and rasterize the template glyph vocabulary once per common font
+
+    Loads the font map, HarfBuzz faces and Cairo glyph caches up front, so a
+    preloading parent process hands every forked worker a warm cache.
+    Cairo's per-font glyph cache then serves as the digit atlas: numeric
+    cells composite already-rasterized glyph masks instead of re-rendering.
+    """
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 2048, 128)
+    ctx = cairo.Context(surface)
+    for family in WARM_UP_FAMILIES:
+        for weight in WARM_UP_WEIGHTS:
+            for size in WARM_UP_SIZES:
+                draw_text(ctx, WARM_UP_GLYPHS, family, size, 0, 0, weight=weight)
+    for weight in WARM_UP_WEIGHTS:
+        for size in WARM_UP_NUMBER_SIZES:
+            draw_text(ctx, WARM_UP_NUMBER_GLYPHS, 'IBM Plex Mono', size, 0, 0, weight=weight)
+    surface.flush()
 
-    This is called by app.py when cardType='test'
-    Tests: background, panels, text rendering, gradients, branding
+
+def png_compress_level(options):
+    """
+    Resolve the zlib level for a request's PNG
 
     Args:
-        format_key: '1:1' or '9:16'
-        workout_data: Ignored for test card
-        options: Dict with rendering options
+        options: Dict with optional 'pngLevel' (0-9)
 
-    Returns: PNG bytes
+    Returns: Compression level, PNG_COMPRESS_LEVEL when not given or invalid
     """
-    if options is None:
-        options = {}
+    level = (options or {}).get('pngLevel')
+    if isinstance(level, int) and not isinstance(level, bool) and 0 <= level <= 9:
+        return level
+    return PNG_COMPRESS_LEVEL
 
-    # Get dimensions (defined locally to avoid circular import)
-    DIMENSIONS = {
-        '1:1': (2160, 2160),
-        '9:16': (2160, 3840),
-    }
-    width, height = DIMENSIONS[format_key]
 
-    # Setup canvas
-    surface, ctx = setup_canvas(width, height)
+def surface_to_png_bytes(surface, options=None):
+    """
+    Write Cairo surface to PNG bytes
+
+    Encodes straight from the surface's pixel buffer with Pillow at
+    PNG_COMPRESS_LEVEL (or the request's 'pngLevel' option), instead of
+    Cairo's write_to_png (libpng at level 6).
+    """
+    if sys.byteorder != 'little':
+        # ARGB32 is native-endian; the BGRa raw mode below assumes little-endian
+        buffer = BytesIO()
+        surface.write_to_png(buffer)
+        return buffer.getvalue()
+
+    surface.flush()
+    # 'BGRa' = premultiplied BGRA, which Pillow un-premultiplies into RGBA
+    image = Image.frombuffer(
+        'RGBA', (surface.get_width(), surface.get_height()), surface.get_data(),
+        'raw', 'BGRa', surface.get_stride(), 1
+    )
+    buffer = BytesIO()
+    image.save(buffer, 'PNG', compress_level=png_compress_level(options))
+    return buffer.getvalue()
+
+
+@layer_cache(maxsize=1)
+def _test_card_layer(format_key, scale):
+    """
+    Pre-render everything on the test card except grain and branding
+
+    The test card has no data inputs, so one surface per (format, scale)
+    serves every request. It is a diagnostic card, so nothing is pinned and
+    each worker keeps only its most recent layer.
+    """
+    width, height = DIMENSIONS[format_key]
+    surface, ctx = create_layer(width, height, scale)
 
     # Draw background
     draw_background(ctx, width, height, DARK_BG)
@@ -353,7 +645,7 @@ def render_test_card(format_key, workout_data=None, options=None):
 
     # Panel border
     draw_rounded_rect(ctx, panel_padding, 200, panel_width, panel_height, 24)
-    ctx.set_source_rgb(*COPPER)
+    ctx.set_source(solid_pattern(COPPER))
     ctx.set_line_width(2)
     ctx.stroke()
 
@@ -381,12 +673,40 @@ def render_test_card(format_key, workout_data=None, options=None):
     for i, (name, color) in enumerate(colors):
         x = color_x_start + (i * 180)
         # Color swatch
-        ctx.set_source_rgb(*color)
+        ctx.set_source(solid_pattern(color))
         ctx.rectangle(x, color_y, 120, 80)
         ctx.fill()
         # Label
         draw_text(ctx, name, "IBM Plex Sans", 20, x + 60, color_y + 100, TEXT_MUTED, align='center')
 
+    surface.flush()
+    return surface
+
+
+def render_test_card(format_key, workout_data=None, options=None):
+    """
+    Render a test card to verify the rendering pipeline
+
+    This is called by app.py when cardType='test'
+    Tests: background, panels, text rendering, gradients, branding
+
+    Args:
+        format_key: '1:1' or '9:16'
+        workout_data: Ignored for test card
+        options: Dict with rendering options
+
+    Returns: PNG bytes
+    """
+    if options is None:
+        options = {}
+
+    width, height = DIMENSIONS[format_key]
+    scale = render_scale(options)
+
+    # Setup canvas and paint the cached static layout
+    surface, ctx = setup_canvas(width, height, scale)
+    blit_surface(ctx, _test_card_layer(format_key, scale))
+
     # Add subtle grain texture
     draw_grain_texture(ctx, width, height, opacity=0.03)
 
@@ -394,4 +714,4 @@ def render_test_card(format_key, workout_data=None, options=None):
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
     # Convert to PNG bytes
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
@@ -0,0 +1,27 @@
+"""
+Shared share card constants
+Card dimensions and design system colors, kept free of Cairo/Pango imports
+so app.py and every template can import them without import-order concerns
+"""
+
+from types import MappingProxyType
+
+# Supported card dimensions (width, height) at 2160px base (read-only)
+DIMENSIONS = MappingProxyType({
+    '1:1': (2160, 2160),      # Instagram square
+    '9:16': (2160, 3840),     # Instagram/TikTok story
+})
+
+# Color constants - Canvas design system colors
+DARK_BG = (0.03, 0.03, 0.04)  # #08080a
+COPPER = (0.72, 0.45, 0.20)   # #B87333
+GOLD = (0.83, 0.65, 0.29)     # #D4A54A
+ROSE = (0.79, 0.48, 0.48)     # #C97B7B
+TEXT_PRIMARY = (1.0, 1.0, 1.0)      # white
+TEXT_SECONDARY = (0.62, 0.63, 0.68) # #9FA0AD
+TEXT_MUTED = (0.35, 0.36, 0.42)     # #5A5B6A
+TEAL = (0.30, 0.70, 0.65)           # for stroke rate column
+WARM_WHITE = (0.95, 0.93, 0.88)     # for subtle warm text
+AMBER = (0.85, 0.65, 0.20)          # for accent highlights
+SLATE = (0.25, 0.27, 0.30)          # for subtle backgrounds
+DEEP_COPPER = (0.55, 0.35, 0.15)    # for darker accents
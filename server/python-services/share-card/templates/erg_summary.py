@@ -3,19 +3,18 @@ Erg Summary Card - Design A (Evolved v5)
 Data-forward layout with warm copper accents and geometric precision
 """
 
+from functools import lru_cache
 from templates.base_template import (
-    setup_canvas, draw_background, draw_text, draw_gradient_rect,
+    setup_canvas, create_layer, render_scale, blit_surface, draw_background, draw_text,
+    draw_text_columns, draw_gradient_rect,
     draw_rounded_rect, draw_panel, draw_accent_stripe, draw_grain_texture,
-    draw_oarbit_branding, surface_to_png_bytes,
-    DARK_BG, COPPER, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED
+    draw_oarbit_branding, surface_to_png_bytes, solid_pattern, layer_cache,
+    DARK_BG, COPPER, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED,
+    DIMENSIONS, DEFAULT_RENDER_SCALE
 )
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
+@lru_cache(maxsize=1024)
 def format_time(seconds):
     """Format seconds to MM:SS.d"""
     mins = int(seconds // 60)
@@ -23,6 +22,7 @@ def format_time(seconds):
     return f"{mins}:{secs:04.1f}"
 
 
+@lru_cache(maxsize=1024)
 def format_pace(seconds_per_500m):
     """Format pace to M:SS.d per 500m"""
     pace_parts = seconds_per_500m.split(':')
@@ -31,6 +31,91 @@ def format_pace(seconds_per_500m):
     return f"{mins}:{secs:04.1f}"
 
 
+def format_split_rows(splits, include_hr):
+    """
+    Format every splits-table row up front, in one pass
+
+    Returns: List of row tuples (#N, pace, watts, SR[, HR])
+    """
+    rows = []
+    for split in splits:
+        row = (
+            f"#{split['split_number']}",
+            str(split['pace']),
+            str(split['watts']),
+            str(split['stroke_rate']),
+        )
+        if include_hr:
+            row += (str(split['heart_rate']),)
+        rows.append(row)
+    return rows
+
+
+# Copper header panel height (top section)
+HEADER_HEIGHT = 480
+
+
+@layer_cache(maxsize=1)
+def _static_layer(format_key, scale):
+    """
+    Pre-render the parts of the card that never change for a format:
+    background, copper header gradient, chamfered corners and ruled lines
+
+    The default-scale layers are pinned while preloading (pin_default_layers);
+    a worker keeps one other-quality layer of its own.
+
+    Returns: ImageSurface at the output pixel size, blitted once per render
+    """
+    width, height = DIMENSIONS[format_key]
+    surface, ctx = create_layer(width, height, scale)
+
+    draw_background(ctx, width, height, DARK_BG)
+
+    # --- TOP SECTION: Copper gradient panel ---
+    draw_gradient_rect(
+        ctx, 0, 0, width, HEADER_HEIGHT,
+        (0.72, 0.45, 0.20),  # Copper
+        (0.08, 0.08, 0.10),  # Fade to dark
+        direction='vertical'
+    )
+
+    # --- GEOMETRIC DECORATIVE ELEMENTS ---
+    # Chamfered corner accent (top right)
+    accent_size = 80
+    ctx.set_source(solid_pattern(COPPER))
+    ctx.move_to(width - accent_size, 0)
+    ctx.line_to(width, 0)
+    ctx.line_to(width, accent_size)
+    ctx.close_path()
+    ctx.fill()
+
+    # Bottom left chamfered corner
+    ctx.set_source(solid_pattern(COPPER))
+    ctx.move_to(0, height - accent_size)
+    ctx.line_to(0, height)
+    ctx.line_to(accent_size, height)
+    ctx.close_path()
+    ctx.fill()
+
+    # Subtle ruled lines as texture
+    ctx.set_source(solid_pattern(COPPER, 0.15))  # Copper with low opacity
+    ctx.set_line_width(2)
+    for i in range(3):
+        y_pos = 40 + (i * 12)
+        ctx.move_to(width - 300, y_pos)
+        ctx.line_to(width - 120, y_pos)
+        ctx.stroke()
+
+    surface.flush()
+    return surface
+
+
+def pin_default_layers():
+    """Render the default-scale static layer of every format, to be shared by forked workers"""
+    for format_key in DIMENSIONS:
+        _static_layer.pin(format_key, DEFAULT_RENDER_SCALE)
+
+
 def render_erg_summary(format_key, workout_data, options):
     """
     Design A: Evolved v5 - Data-forward precision instrument
@@ -48,17 +133,12 @@ def render_erg_summary(format_key, workout_data, options):
     is_story = format_key == '9:16'
 
     # Setup canvas
-    surface, ctx = setup_canvas(width, height)
-    draw_background(ctx, width, height, DARK_BG)
+    scale = render_scale(options)
+    surface, ctx = setup_canvas(width, height, scale)
 
-    # --- TOP SECTION: Copper gradient panel ---
-    header_height = 480
-    draw_gradient_rect(
-        ctx, 0, 0, width, header_height,
-        (0.72, 0.45, 0.20),  # Copper
-        (0.08, 0.08, 0.10),  # Fade to dark
-        direction='vertical'
-    )
+    # Background, header gradient and corner decorations (cached per format)
+    blit_surface(ctx, _static_layer(format_key, scale))
+    header_height = HEADER_HEIGHT
 
     # Workout title at top
     title_y = 100
@@ -117,21 +197,6 @@ def render_erg_summary(format_key, workout_data, options):
 
     row1_start_x = (width - (len(metrics_row1) * grid_spacing)) / 2 + (grid_spacing / 2)
 
-    for i, (value, label) in enumerate(metrics_row1):
-        x = row1_start_x + (i * grid_spacing)
-
-        # Value
-        draw_text(
-            ctx, value, "IBM Plex Mono", 52,
-            x, grid_y, TEXT_PRIMARY, weight='SemiBold', align='center'
-        )
-
-        # Label
-        draw_text(
-            ctx, label, "IBM Plex Sans", 28,
-            x, grid_y + 70, TEXT_MUTED, weight='Regular', align='center'
-        )
-
     # Row 2: Distance, Duration
     grid_y2 = grid_y + 200
     metrics_row2 = [
@@ -141,19 +206,26 @@ def render_erg_summary(format_key, workout_data, options):
 
     row2_start_x = (width - (len(metrics_row2) * grid_spacing * 1.2)) / 2 + (grid_spacing * 0.6)
 
-    for i, (value, label) in enumerate(metrics_row2):
-        x = row2_start_x + (i * grid_spacing * 1.2)
+    # Both rows share one value style and one label style - draw all values,
+    # then all labels, so each style is set once
+    metric_cells = [
+        (value, label, row1_start_x + (i * grid_spacing), grid_y)
+        for i, (value, label) in enumerate(metrics_row1)
+    ] + [
+        (value, label, row2_start_x + (i * grid_spacing * 1.2), grid_y2)
+        for i, (value, label) in enumerate(metrics_row2)
+    ]
 
-        # Value
+    for value, _, x, y in metric_cells:
         draw_text(
             ctx, value, "IBM Plex Mono", 52,
-            x, grid_y2, TEXT_PRIMARY, weight='SemiBold', align='center'
+            x, y, TEXT_PRIMARY, weight='SemiBold', align='center'
         )
 
-        # Label
+    for _, label, x, y in metric_cells:
         draw_text(
             ctx, label, "IBM Plex Sans", 28,
-            x, grid_y2 + 70, TEXT_MUTED, weight='Regular', align='center'
+            x, y + 70, TEXT_MUTED, weight='Regular', align='center'
         )
 
     # --- SPLITS TABLE ---
@@ -164,12 +236,15 @@ def render_erg_summary(format_key, workout_data, options):
     panel_width = width - (panel_padding * 2)
 
     # Determine number of splits to show
-    splits_to_show = workout_data['splits'][:4] if not is_story else workout_data['splits']
+    splits_all = workout_data['splits']
+    splits_to_show = splits_all if is_story else splits_all[:4]
+    n_splits = len(splits_to_show)
+    split_rows = format_split_rows(splits_to_show, include_hr=is_story)
 
     # Calculate panel height based on splits
     splits_row_height = 80
     splits_header_height = 100
-    panel_height = splits_header_height + (len(splits_to_show) * splits_row_height) + 80
+    panel_height = splits_header_height + (n_splits * splits_row_height) + 80
 
     # Draw panel
     draw_panel(
@@ -184,44 +259,32 @@ def render_erg_summary(format_key, workout_data, options):
         width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center'
     )
 
+    # Column x-positions (shared by header and every row)
+    col_x = (
+        panel_padding + 120,
+        panel_padding + panel_width * 0.35,
+        panel_padding + panel_width * 0.55,
+        panel_padding + panel_width * 0.75,
+        panel_padding + panel_width * 0.88,
+    )
+    if not is_story:
+        col_x = col_x[:4]  # HR column is story-only
+
     # Column headers
     col_header_y = header_y + 80
-    col_positions = [
-        (panel_padding + 120, "Split"),
-        (panel_padding + panel_width * 0.35, "Pace"),
-        (panel_padding + panel_width * 0.55, "Watts"),
-        (panel_padding + panel_width * 0.75, "SR"),
-    ]
-
-    if is_story:
-        col_positions.append((panel_padding + panel_width * 0.88, "HR"))
+    col_labels = ("Split", "Pace", "Watts", "SR", "HR")
 
-    for x, label in col_positions:
+    for x, label in zip(col_x, col_labels):
         draw_text(
             ctx, label, "IBM Plex Sans", 28,
             x, col_header_y, TEXT_MUTED, weight='SemiBold', align='left'
         )
 
-    # Splits rows
-    row_y = col_header_y + 60
-    for split in splits_to_show:
-        row_data = [
-            (panel_padding + 120, f"#{split['split_number']}"),
-            (panel_padding + panel_width * 0.35, split['pace']),
-            (panel_padding + panel_width * 0.55, f"{split['watts']}"),
-            (panel_padding + panel_width * 0.75, f"{split['stroke_rate']}"),
-        ]
-
-        if is_story:
-            row_data.append((panel_padding + panel_width * 0.88, f"{split['heart_rate']}"))
-
-        for x, value in row_data:
-            draw_text(
-                ctx, str(value), "IBM Plex Mono", 32,
-                x, row_y, TEXT_PRIMARY, weight='Regular', align='left'
-            )
-
-        row_y += splits_row_height
+    # Splits rows - drawn as one tab-stopped layout
+    row_y = draw_text_columns(
+        ctx, split_rows, "IBM Plex Mono", 32,
+        col_x, col_header_y + 60, splits_row_height, TEXT_PRIMARY, weight='Regular'
+    )
 
     # --- ATHLETE NAME (if enabled) ---
     if options.get('showName', True):
@@ -231,37 +294,10 @@ def render_erg_summary(format_key, workout_data, options):
             width / 2, name_y, TEXT_SECONDARY, weight='SemiBold', align='center'
         )
 
-    # --- GEOMETRIC DECORATIVE ELEMENTS ---
-    # Chamfered corner accent (top right)
-    accent_size = 80
-    ctx.set_source_rgb(*COPPER)
-    ctx.move_to(width - accent_size, 0)
-    ctx.line_to(width, 0)
-    ctx.line_to(width, accent_size)
-    ctx.close_path()
-    ctx.fill()
-
-    # Bottom left chamfered corner
-    ctx.set_source_rgb(*COPPER)
-    ctx.move_to(0, height - accent_size)
-    ctx.line_to(0, height)
-    ctx.line_to(accent_size, height)
-    ctx.close_path()
-    ctx.fill()
-
-    # Subtle ruled lines as texture
-    ctx.set_source_rgba(0.72, 0.45, 0.20, 0.15)  # Copper with low opacity
-    ctx.set_line_width(2)
-    for i in range(3):
-        y_pos = 40 + (i * 12)
-        ctx.move_to(width - 300, y_pos)
-        ctx.line_to(width - 120, y_pos)
-        ctx.stroke()
-
     # --- GRAIN TEXTURE ---
     draw_grain_texture(ctx, width, height, opacity=0.03)
 
     # --- BRANDING ---
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
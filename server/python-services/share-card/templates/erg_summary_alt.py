@@ -12,19 +12,20 @@ Machine-aware display:
 """
 
 import math
+from bisect import bisect_left
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, wraps
+import cairocffi as cairo
+import numpy as np
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect,
+    setup_canvas, create_layer, render_scale, blit_surface, draw_text, draw_gradient_rect,
     draw_rounded_rect, draw_grain_texture, draw_oarbit_branding,
-    surface_to_png_bytes, hex_to_rgb,
-    DARK_BG, GOLD, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE, COPPER, TEAL
+    surface_to_png_bytes, solid_pattern, layer_cache,
+    DARK_BG, GOLD, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE, COPPER, TEAL,
+    DIMENSIONS, DEFAULT_RENDER_SCALE
 )
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 MACHINE_LABELS = {
     'rower': 'ERG',
     'slides': 'DYNAMIC',
@@ -37,7 +38,19 @@ MACHINE_LABELS = {
 # Note: REST_COLOR imported as TEAL from base_template
 
 # Standard test distances where TOTAL TIME is the hero
-TEST_DISTANCES = {500, 1000, 2000, 5000, 6000}
+TEST_DISTANCES = frozenset({500, 1000, 2000, 5000, 6000})
+
+# Hero title auto-size: titles up to TITLE_LENGTH_TIERS[i] chars use
+# TITLE_FONT_SIZES[i]; longer titles use the last size (raised minimum to 100px)
+TITLE_LENGTH_TIERS = (12, 18, 24)
+TITLE_FONT_SIZES = (200, 160, 120, 100)
+
+# Machine / workout type groups
+BIKE_MACHINES = frozenset({'bike', 'bikerg'})
+FIXED_TIME_TYPES = frozenset({'FixedTimeSplits', 'FixedTimeInterval'})
+FIXED_DIST_TYPES = frozenset({'FixedDistanceSplits', 'FixedDistanceInterval'})
+VARIABLE_INTERVAL_TYPES = frozenset({'VariableInterval', 'VariableIntervalUndefinedRest'})
+SHORT_SUMMARY_TYPES = frozenset({'JustRow', 'FixedTimeSplits'})  # Also the time-split headers
 
 
 # ─────────────────────────────────────────────
@@ -48,35 +61,65 @@ def _machine(data):
     return (data.get('rawMachineType') or data.get('machineType') or 'rower').lower()
 
 
-def is_bike(data):
-    return _machine(data) in ('bike', 'bikerg')
+def machine_label(data):
+    return MACHINE_LABELS.get(_machine(data), 'ERG')
 
 
-def pace_unit(data):
-    return '/1000m' if is_bike(data) else '/500m'
+def machine_context(data):
+    """Resolve every machine-dependent value once per render.
+    pace_unit_short is the compact unit for tight table columns.
+    """
+    m = _machine(data)
+    bike = m in BIKE_MACHINES
+    return {
+        'bike': bike,
+        'pace_unit': '/1000m' if bike else '/500m',
+        'pace_unit_short': '/1Km' if bike else '/500m',
+        'rate_label': 'RPM' if bike else 'SPM',
+        'machine_label': MACHINE_LABELS.get(m, 'ERG'),
+    }
 
 
-def pace_unit_short(data):
-    """Compact version for tight table columns"""
-    return '/1Km' if is_bike(data) else '/500m'
+# ─────────────────────────────────────────────
+# Formatting
+# ─────────────────────────────────────────────
 
+NUMBER_TYPES = (int, float)
 
-def rate_label(data):
-    return 'RPM' if is_bike(data) else 'SPM'
 
+def memoize_for(*cache_types, maxsize=1024):
+    """lru_cache for formatters fed raw workoutData values.
+    Only calls whose first argument is exactly one of cache_types go through the
+    cache; anything else (None, bools, or a list/dict from a malformed payload,
+    which cannot be hashed) runs the plain function, as if it were not memoized.
+    """
+    def decorator(fn):
+        cached = lru_cache(maxsize=maxsize)(fn)
 
-def machine_label(data):
-    return MACHINE_LABELS.get(_machine(data), 'ERG')
+        @wraps(fn)
+        def wrapper(value, *args):
+            if type(value) in cache_types:
+                return cached(value, *args)
+            return fn(value, *args)
 
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
 
-# ─────────────────────────────────────────────
-# Formatting
-# ─────────────────────────────────────────────
 
+@memoize_for(*NUMBER_TYPES)
 def format_time_clean(seconds):
     """Format seconds, dropping unnecessary trailing .0"""
     if not seconds:
         return '--:--'
+    if type(seconds) is int:
+        # Whole seconds: integer math, never a tenths digit
+        hrs, rem = divmod(seconds, 3600)
+        mins, whole_secs = divmod(rem, 60)
+        if hrs > 0:
+            return f"{hrs}:{mins:02d}:{whole_secs:02d}"
+        return f"{mins}:{whole_secs:02d}"
     seconds = float(seconds)
     hrs = int(seconds // 3600)
     mins = int((seconds % 3600) // 60)
@@ -93,20 +136,26 @@ def format_time_clean(seconds):
     return f"{mins}:{secs:04.1f}"
 
 
-def format_pace(pace_tenths_per_500m, data):
+@memoize_for(*NUMBER_TYPES)
+def format_pace(pace_tenths_per_500m, bike):
     """Format pace for display, adjusting for machine type.
     DB stores tenths-per-500m for all machines.
-    Bike displays per 1000m (multiply by 2).
+    Bike displays per 1000m (multiply by 2) - pass machine_context(data)['bike'].
     """
     if not pace_tenths_per_500m:
         return '--:--'
-    tenths = pace_tenths_per_500m * 2 if is_bike(data) else pace_tenths_per_500m
+    tenths = pace_tenths_per_500m * 2 if bike else pace_tenths_per_500m
+    if type(tenths) is int:
+        # Whole tenths (the usual case): integer math, no float formatting
+        mins, rem = divmod(tenths, 600)
+        return f"{mins}:{rem // 10:02d}.{rem % 10}"
     total_seconds = tenths / 10
     mins = int(total_seconds // 60)
     secs = total_seconds % 60
     return f"{mins}:{secs:04.1f}"
 
 
+@memoize_for(*NUMBER_TYPES)
 def format_rest_tenths(tenths):
     """Format rest time from tenths-of-seconds to clean string"""
     if not tenths:
@@ -119,6 +168,7 @@ def format_rest_tenths(tenths):
     return f":{secs:02d}"
 
 
+@memoize_for(*NUMBER_TYPES)
 def format_time_coach(seconds):
     """Format time in coach whiteboard style: 11:00→11', 1:30→1'30\", 0:45→45\".
     Used for titles — how coaches actually write intervals.
@@ -135,6 +185,7 @@ def format_time_coach(seconds):
     return f"{secs}\""
 
 
+@memoize_for(*NUMBER_TYPES)
 def format_rest_coach(tenths):
     """Format rest tenths in coach style: 600→1'r, 300→30\"r, 900→1'30\"r"""
     if not tenths:
@@ -149,6 +200,7 @@ def format_rest_coach(tenths):
     return f"{secs}\"r"
 
 
+@memoize_for(*NUMBER_TYPES)
 def format_distance(meters):
     """Format distance: 10,000 → '10K', 2000 → '2K', 500 → '500m'"""
     if not meters:
@@ -158,57 +210,117 @@ def format_distance(meters):
     return f"{meters:,}m"
 
 
+@memoize_for(*NUMBER_TYPES)
+def format_meters(meters):
+    """Format exact meters with thousands separators: 10000 → '10,000m'"""
+    return f"{meters:,}m"
+
+
+@memoize_for(str)
 def format_date(iso_date):
+    if not isinstance(iso_date, str):
+        return ''  # null / non-string dates render blank
     try:
-        dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+        # Python 3.11+ parses a trailing 'Z' directly (strptime is ~40x slower)
+        dt = datetime.fromisoformat(iso_date)
         return dt.strftime('%b %d, %Y')
-    except (ValueError, AttributeError):
-        return iso_date or ''
+    except ValueError:
+        return iso_date
 
 
 # ─────────────────────────────────────────────
 # Workout Classification
 # ─────────────────────────────────────────────
 
+@memoize_for(str, maxsize=32)
+def _is_interval_type(wtype):
+    return 'interval' in wtype.lower()
+
+
 def is_interval(data):
-    return data.get('isInterval', False) or 'interval' in (data.get('workoutType') or '').lower()
+    return data.get('isInterval', False) or _is_interval_type(data.get('workoutType') or '')
 
 
 def is_fixed_time_type(data):
     """Splits/intervals where TIME is the fixed dimension (distance varies)"""
     wt = data.get('workoutType', '')
-    return wt in ('FixedTimeSplits', 'FixedTimeInterval')
+    return wt in FIXED_TIME_TYPES
 
 
 def is_fixed_dist_type(data):
     """Splits/intervals where DISTANCE is the fixed dimension (time varies)"""
     wt = data.get('workoutType', '')
-    return wt in ('FixedDistanceSplits', 'FixedDistanceInterval')
+    return wt in FIXED_DIST_TYPES
 
 
-def has_uniform_rest(splits):
-    """Check if all intervals have the same rest time.
-    Excludes last interval's rest (PM5 records cooldown, not a real rest).
-    """
-    work_splits = splits[:-1] if len(splits) > 1 else splits
-    rest_times = [s.get('restTime') for s in work_splits if s.get('restTime')]
-    if not rest_times:
-        return True, None
-    if len(set(rest_times)) == 1:
-        return True, rest_times[0]
-    return False, None
+@dataclass(frozen=True, slots=True)
+class SplitSummary:
+    """Uniformity and rest facts about a workout's splits, gathered in one pass."""
+    n: int
+    uniform_distance: object  # Shared distanceM, or None if absent/varies
+    uniform_time: object      # First timeSeconds when all match to the second, else None
+    rest_uniform: bool        # True when every work rest matches (or there is none)
+    uniform_rest: object      # Shared restTime, or None
+    avg_rest: object          # Mean work restTime, or None when there is no rest
+    has_recovery_hr: bool     # Any heartRateRest recorded
 
 
-def has_valuable_rest_data(splits):
-    """Check if any interval has recovery HR worth showing"""
-    return any(s.get('heartRateRest') for s in splits)
+def summarize_splits(splits):
+    """Walk the splits once and collect the facts the title, table header
+    and rest-row logic need.
+    Work rests exclude the last interval's rest (PM5 records cooldown, not a real rest).
+    """
+    n = len(splits)
+    last = n - 1 if n > 1 else n
+    distance = time = time_key = rest = None
+    distances_uniform = times_uniform = rest_uniform = True
+    rest_total = rest_count = 0
+    has_recovery_hr = False
+
+    for i, s in enumerate(splits):
+        d = s.get('distanceM')
+        if d:
+            if distance is None:
+                distance = d
+            elif d != distance:
+                distances_uniform = False
+
+        t = s.get('timeSeconds')
+        if t:
+            if time is None:
+                time, time_key = t, int(t)
+            elif int(t) != time_key:
+                times_uniform = False
+
+        if i < last:
+            r = s.get('restTime')
+            if r:
+                if rest is None:
+                    rest = r
+                elif r != rest:
+                    rest_uniform = False
+                rest_total += r
+                rest_count += 1
+
+        if not has_recovery_hr and s.get('heartRateRest'):
+            has_recovery_hr = True
+
+    return SplitSummary(
+        n=n,
+        uniform_distance=distance if distances_uniform else None,
+        uniform_time=time if times_uniform else None,
+        rest_uniform=rest_uniform,
+        uniform_rest=rest if rest_uniform else None,
+        avg_rest=rest_total / rest_count if rest_count else None,
+        has_recovery_hr=has_recovery_hr,
+    )
 
 
 # ─────────────────────────────────────────────
 # Title Builder
 # ─────────────────────────────────────────────
 
-def build_title(data):
+def build_title(data, summary=None):
     """Build concise workout title in coach whiteboard style.
     Machine type is shown separately on the card.
     Examples: "7x11' / 1'r", "1,169m", "5x2K / ~56\"r", "10'"
@@ -226,31 +338,27 @@ def build_title(data):
 
     # ── Interval workouts ──
     if is_interval(data) and splits:
-        n = len(splits)
+        summary = summary or summarize_splits(splits)
+        n = summary.n
 
         if wtype == 'FixedDistanceInterval':
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                d = distances[0]
-                rest = _rest_label(splits)
-                return f"{n}x{format_distance(d)}{rest}"
+            if summary.uniform_distance:
+                rest = _rest_label(summary)
+                return f"{n}x{format_distance(summary.uniform_distance)}{rest}"
 
         if wtype == 'FixedTimeInterval':
-            times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-            if times and len(set(int(t) for t in times)) == 1:
-                t = format_time_coach(times[0])
-                rest = _rest_label(splits)
+            if summary.uniform_time:
+                t = format_time_coach(summary.uniform_time)
+                rest = _rest_label(summary)
                 return f"{n}x{t}{rest}"
 
-        if wtype in ('VariableInterval', 'VariableIntervalUndefinedRest'):
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                d = distances[0]
-                rest = _rest_label(splits, approx=True)
-                return f"{n}x{format_distance(d)}{rest}"
+        if wtype in VARIABLE_INTERVAL_TYPES:
+            if summary.uniform_distance:
+                rest = _rest_label(summary, approx=True)
+                return f"{n}x{format_distance(summary.uniform_distance)}{rest}"
             return f"{n} pieces"
 
-        rest = _rest_label(splits)
+        rest = _rest_label(summary)
         return f"{n} intervals{rest}"
 
     # ── Continuous pieces ──
@@ -265,93 +373,91 @@ def build_title(data):
     return machine_label(data)
 
 
-def _rest_label(splits, approx=False):
+def _rest_label(summary, approx=False):
     """Build rest portion of title in coach style: ' / 1'r' or ' / ~56\"r'.
-    Excludes last interval's rest (PM5 records cooldown, not a real rest).
+    Uses the work rests from summarize_splits (cooldown rest excluded).
     """
-    work_splits = splits[:-1] if len(splits) > 1 else splits
-    rest_times = [s.get('restTime') for s in work_splits if s.get('restTime')]
-    if not rest_times:
+    if summary.avg_rest is None:
         return ''
-    if len(set(rest_times)) == 1:
-        formatted = format_rest_coach(rest_times[0])
+    if summary.rest_uniform:
+        formatted = format_rest_coach(summary.uniform_rest)
         if approx:
             return f" / ~{formatted}"
         return f" / {formatted}"
     # Variable rest — show approximate average
-    avg_rest = sum(rest_times) / len(rest_times)
-    return f" / ~{format_rest_coach(avg_rest)}"
+    return f" / ~{format_rest_coach(summary.avg_rest)}"
 
 
 # ─────────────────────────────────────────────
 # Hero Metric Selection
 # ─────────────────────────────────────────────
 
-def get_hero(data):
+def get_hero(data, machine=None):
     """Return (value_string, label_string) for the hero metric."""
+    machine = machine or machine_context(data)
+    bike = machine['bike']
+    pu = machine['pace_unit']
     distance = data.get('distanceM')
     duration = data.get('durationSeconds')
     avg_pace_tenths = data.get('avgPaceTenths')
     avg_watts = data.get('avgWatts')
     wtype = data.get('workoutType', '')
+    intervals = is_interval(data)
 
     # Test distances: TOTAL TIME is king (only for continuous pieces, not intervals)
-    if distance and distance in TEST_DISTANCES and not is_interval(data):
+    if distance and distance in TEST_DISTANCES and not intervals:
         return format_time_clean(duration), "TOTAL TIME"
 
     # Fixed-time intervals on bike: AVG WATTS (what bike athletes care about)
-    if wtype == 'FixedTimeInterval' and is_bike(data) and avg_watts:
+    if wtype == 'FixedTimeInterval' and bike and avg_watts:
         return str(avg_watts), "AVG WATTS"
 
     # All other intervals: AVG SPLIT pace
-    if is_interval(data):
-        return format_pace(avg_pace_tenths, data), f"AVG SPLIT {pace_unit(data)}"
+    if intervals:
+        return format_pace(avg_pace_tenths, bike), f"AVG SPLIT {pu}"
 
     # Continuous pieces: AVG PACE
-    return format_pace(avg_pace_tenths, data), f"AVG PACE {pace_unit(data)}"
+    return format_pace(avg_pace_tenths, bike), f"AVG PACE {pu}"
 
 
 # ─────────────────────────────────────────────
 # Splits / Intervals Table Header
 # ─────────────────────────────────────────────
 
-def build_table_header(data, splits):
+def build_table_header(data, splits, summary=None):
     """Build descriptive section header like 'SPLITS (9 x 5:00)' or 'INTERVALS (7 x 11:00 / 1:00r)'"""
-    n = len(splits)
+    summary = summary or summarize_splits(splits)
+    n = summary.n
     wtype = data.get('workoutType', '')
 
     if is_interval(data):
         # Fixed time intervals
         if wtype == 'FixedTimeInterval':
-            times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-            if times and len(set(int(t) for t in times)) == 1:
-                uniform, rest = has_uniform_rest(splits)
+            if summary.uniform_time:
+                rest = summary.uniform_rest
                 rest_str = f" / {format_rest_tenths(rest)}r" if rest else ""
-                return f"INTERVALS ({n} x {format_time_clean(times[0])}{rest_str})"
+                return f"INTERVALS ({n} x {format_time_clean(summary.uniform_time)}{rest_str})"
 
         # Fixed distance intervals
         if wtype == 'FixedDistanceInterval':
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                uniform, rest = has_uniform_rest(splits)
+            if summary.uniform_distance:
+                rest = summary.uniform_rest
                 rest_str = f" / {format_rest_tenths(rest)}r" if rest else ""
-                return f"INTERVALS ({n} x {format_distance(distances[0])}{rest_str})"
+                return f"INTERVALS ({n} x {format_distance(summary.uniform_distance)}{rest_str})"
 
         # Variable
         return f"INTERVALS ({n} pieces)"
 
     # Continuous splits
     # Fixed time splits — show split duration
-    if wtype in ('FixedTimeSplits', 'JustRow'):
-        times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-        if times and len(set(int(t) for t in times)) == 1:
-            return f"SPLITS ({n} x {format_time_clean(times[0])})"
+    if wtype in SHORT_SUMMARY_TYPES:
+        if summary.uniform_time:
+            return f"SPLITS ({n} x {format_time_clean(summary.uniform_time)})"
 
     # Fixed distance splits
     if wtype == 'FixedDistanceSplits':
-        distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-        if distances and len(set(distances)) == 1:
-            return f"SPLITS ({n} x {format_distance(distances[0])})"
+        if summary.uniform_distance:
+            return f"SPLITS ({n} x {format_distance(summary.uniform_distance)})"
 
     return f"SPLITS ({n})"
 
@@ -360,124 +466,252 @@ def build_table_header(data, splits):
 # Visual Helpers
 # ─────────────────────────────────────────────
 
+def _splits_to_arrays(splits):
+    """Return (paces, has_pace): split paces as a float array plus a mask of the
+    splits that recorded one (missing paces are stored as 0).
+    """
+    paces = np.fromiter((s.get('paceTenths') or 0 for s in splits),
+                        dtype=np.float64, count=len(splits))
+    return paces, paces != 0
+
+
 def compute_pace_stats(splits):
-    paces = [s.get('paceTenths') for s in splits if s.get('paceTenths')]
-    if not paces:
-        return None, {}
-    avg = sum(paces) / len(paces)
-    devs = {}
-    for i, s in enumerate(splits):
-        p = s.get('paceTenths')
-        if p and avg > 0:
-            devs[i] = (p - avg) / avg
-    return avg, devs
+    """Return (avg_pace_tenths, deviations) where deviations is an array with one
+    relative deviation from avg per split, NaN for splits without a pace.
+    """
+    paces, has_pace = _splits_to_arrays(splits)
+    if not has_pace.any():
+        return None, np.full(len(splits), np.nan)
+    avg = float(paces[has_pace].mean())
+    if avg <= 0:
+        return avg, np.full(len(splits), np.nan)
+    return avg, np.where(has_pace, (paces - avg) / avg, np.nan)
+
+
+WAVE_COUNT = 5
+WAVE_STEP = 10  # Polyline sample spacing in px
+
+
+@lru_cache(maxsize=4)
+def wave_polylines(width, height):
+    """Precompute the wave polylines for a canvas size.
+    Returns one tuple of (x, y) points per wave, computed with NumPy
+    (cached, so a JIT kernel would have nothing left to speed up).
+    """
+    xs = np.arange(0, width, WAVE_STEP, dtype=np.float64)
+    i = np.arange(WAVE_COUNT, dtype=np.float64)[:, None]
+    y_base = height * 0.2 + (i * height * 0.15)
+    amp = 80 + (i * 20)
+    freq = 0.003 + (i * 0.0005)
+    # (WAVE_COUNT, len(xs)) in a single broadcast sin
+    ys = y_base + np.sin(xs * freq) * amp
+    x_list = xs.tolist()
+    return tuple(tuple(zip(x_list, row)) for row in ys.tolist())
+
+
+# Waves are drawn in layout coordinates, so one entry per format covers every
+# render scale - build them at import (inherited by preloaded workers)
+for _width, _height in DIMENSIONS.values():
+    wave_polylines(_width, _height)
+del _width, _height
 
 
 def draw_wave_pattern(ctx, width, height, color, opacity=0.08):
     ctx.save()
-    ctx.set_source_rgba(*color, opacity)
+    ctx.set_source(solid_pattern(color, opacity))
     ctx.set_line_width(3)
-    for i in range(5):
-        y_base = height * 0.2 + (i * height * 0.15)
-        amp = 80 + (i * 20)
-        freq = 0.003 + (i * 0.0005)
-        ctx.move_to(0, y_base)
-        for x in range(0, width, 10):
-            ctx.line_to(x, y_base + math.sin(x * freq) * amp)
-        ctx.stroke()
+    # All waves go into one path and are stroked once
+    move_to, line_to = ctx.move_to, ctx.line_to
+    for points in wave_polylines(width, height):
+        move_to(*points[0])
+        for x, y in points:
+            line_to(x, y)
+    ctx.stroke()
     ctx.restore()
 
 
-def draw_pace_dot(ctx, x, y, deviation, radius=8):
-    if deviation is None:
-        return
-    if deviation < -0.005:
-        ctx.set_source_rgba(*GOLD, 0.8)
-    elif deviation > 0.005:
-        ctx.set_source_rgba(*ROSE, 0.5)
-    else:
-        ctx.set_source_rgba(*TEXT_MUTED, 0.4)
-    ctx.arc(x, y, radius, 0, 2 * math.pi)
-    ctx.fill()
+# Pace dot colors: faster than average, within +/-0.5%, slower
+PACE_DOT_THRESHOLD = 0.005
+PACE_DOT_PATTERNS = (
+    solid_pattern(GOLD, 0.8),
+    solid_pattern(TEXT_MUTED, 0.4),
+    solid_pattern(ROSE, 0.5),
+)
+
+
+def pace_dot_classes(deviations):
+    """Classify pace deviations in one vectorized pass: index into
+    PACE_DOT_PATTERNS per split, or -1 where the split has no pace (NaN).
+    """
+    classes = ((deviations >= -PACE_DOT_THRESHOLD).astype(np.int8)
+               + (deviations > PACE_DOT_THRESHOLD))
+    return np.where(np.isnan(deviations), -1, classes)
+
+
+def draw_pace_dots(ctx, x, ys, classes, radius=8):
+    """Draw a column of pace dots, one fill per color class (dots never overlap)."""
+    classes = classes.tolist()
+    for idx, pattern in enumerate(PACE_DOT_PATTERNS):
+        centres = [y for y, cls in zip(ys, classes) if cls == idx]
+        if not centres:
+            continue
+        for y in centres:
+            ctx.new_sub_path()
+            ctx.arc(x, y, radius, 0, math.tau)
+        ctx.set_source(pattern)
+        ctx.fill()
 
 
 # ─────────────────────────────────────────────
 # Table Row Renderers
 # ─────────────────────────────────────────────
 
-def get_table_columns(data):
+# Split numbers, watts, rates and heart rates are small ints - their strings
+# are built once at import and indexed per cell
+SMALL_INT_STRS = tuple(str(i) for i in range(1000))
+
+
+def _int_str(v):
+    if type(v) is int and 0 <= v < 1000:
+        return SMALL_INT_STRS[v]
+    return f"{v}"
+
+
+# Column cell formatters - module level, so column tables can be cached
+def _fmt_dist(s):
+    d = s.get('distanceM')
+    return format_meters(d) if d else '--'
+
+
+def _fmt_time(s):
+    return format_time_clean(s.get('timeSeconds'))
+
+
+def _fmt_pace(s):
+    return format_pace(s.get('paceTenths'), False)
+
+
+def _fmt_pace_bike(s):
+    return format_pace(s.get('paceTenths'), True)
+
+
+def _fmt_watts(s):
+    w = s.get('watts')
+    return _int_str(w) if w else '--'
+
+
+def _fmt_rate(s):
+    sr = s.get('strokeRate')
+    return _int_str(sr) if sr is not None else '--'
+
+
+def _fmt_hr(s):
+    hr = s.get('heartRate')
+    return _int_str(hr) if hr is not None else '--'
+
+
+def get_table_columns(data, machine=None):
     """Return column definitions based on workout type.
-    Each column: (key, header_label, width_weight, align, format_fn)
+    Each column: (key, header_label, format_fn, align)
     Columns are laid out proportionally across the available width.
     """
-    wtype = data.get('workoutType', '')
-    pu = pace_unit_short(data)
-    rl = rate_label(data).lower()
-    bike = is_bike(data)
+    machine = machine or machine_context(data)
+    return _table_columns(data.get('workoutType', ''), machine['bike'])
 
-    # Column key → (header, format_fn)
-    def fmt_dist(s):
-        d = s.get('distanceM')
-        return f"{d:,}m" if d else '--'
-    def fmt_time(s):
-        return format_time_clean(s.get('timeSeconds'))
-    def fmt_pace(s):
-        return format_pace(s.get('paceTenths'), data)
-    def fmt_watts(s):
-        w = s.get('watts')
-        return f"{w}" if w else '--'
-    def fmt_rate(s):
-        sr = s.get('strokeRate')
-        return f"{sr}" if sr is not None else '--'
-    def fmt_hr(s):
-        hr = s.get('heartRate')
-        return f"{hr}" if hr is not None else '--'
+
+@lru_cache(maxsize=16)
+def _table_columns(wtype, bike):
+    """Column definitions per (workout type, machine) - built once, shared by renders."""
+    pu = '/1Km' if bike else '/500m'
+    rl = 'RPM' if bike else 'SPM'
+    fmt_pace = _fmt_pace_bike if bike else _fmt_pace
 
     pace_hdr = f'PACE ({pu})'
 
-    if is_fixed_time_type(data):
+    if wtype in FIXED_TIME_TYPES:
         # Time is fixed → distance varies, no time column
-        return [
-            ('dist', 'DIST', fmt_dist, 'left'),
+        return (
+            ('dist', 'DIST', _fmt_dist, 'left'),
             ('pace', pace_hdr, fmt_pace, 'left'),
-            ('watts', 'WATTS', fmt_watts, 'right'),
-            ('rate', rl.upper(), fmt_rate, 'right'),
-            ('hr', 'HR', fmt_hr, 'right'),
-        ]
-    elif is_fixed_dist_type(data):
+            ('watts', 'WATTS', _fmt_watts, 'right'),
+            ('rate', rl, _fmt_rate, 'right'),
+            ('hr', 'HR', _fmt_hr, 'right'),
+        )
+    elif wtype in FIXED_DIST_TYPES:
         # Distance is fixed → time varies, no distance column
-        return [
-            ('time', 'TIME', fmt_time, 'left'),
+        return (
+            ('time', 'TIME', _fmt_time, 'left'),
             ('pace', pace_hdr, fmt_pace, 'left'),
-            ('watts', 'WATTS', fmt_watts, 'right'),
-            ('rate', rl.upper(), fmt_rate, 'right'),
-            ('hr', 'HR', fmt_hr, 'right'),
-        ]
-    elif wtype in ('VariableInterval', 'VariableIntervalUndefinedRest'):
+            ('watts', 'WATTS', _fmt_watts, 'right'),
+            ('rate', rl, _fmt_rate, 'right'),
+            ('hr', 'HR', _fmt_hr, 'right'),
+        )
+    elif wtype in VARIABLE_INTERVAL_TYPES:
         # Everything varies
-        return [
-            ('dist', 'DIST', fmt_dist, 'left'),
-            ('time', 'TIME', fmt_time, 'left'),
+        return (
+            ('dist', 'DIST', _fmt_dist, 'left'),
+            ('time', 'TIME', _fmt_time, 'left'),
             ('pace', pace_hdr, fmt_pace, 'left'),
-            ('watts', 'WATTS', fmt_watts, 'right'),
-            ('rate', rl.upper(), fmt_rate, 'right'),
-            ('hr', 'HR', fmt_hr, 'right'),
-        ]
+            ('watts', 'WATTS', _fmt_watts, 'right'),
+            ('rate', rl, _fmt_rate, 'right'),
+            ('hr', 'HR', _fmt_hr, 'right'),
+        )
     else:
         # JustRow — pace is primary, show all
-        return [
+        return (
             ('pace', pace_hdr, fmt_pace, 'left'),
-            ('watts', 'WATTS', fmt_watts, 'right'),
-            ('rate', rl.upper(), fmt_rate, 'right'),
-            ('hr', 'HR', fmt_hr, 'right'),
-        ]
+            ('watts', 'WATTS', _fmt_watts, 'right'),
+            ('rate', rl, _fmt_rate, 'right'),
+            ('hr', 'HR', _fmt_hr, 'right'),
+        )
+
+
+TABLE_MARGIN = 160  # Symmetric margins (was asymmetric 140)
+FIRST_COLUMN_WEIGHT = 1.3
+
+
+@lru_cache(maxsize=32)
+def table_column_positions(columns, width):
+    """Return the x anchor of each column, as a tuple of 1-tuples.
+    Near-equal width distribution: the first column gets 1.3x weight, the others 1x.
+    Right-aligned columns anchor 10px inside their right edge. Depends only on the
+    cached column tuple and the canvas width, so it is computed once per layout.
+    """
+    table_width = width - 2 * TABLE_MARGIN
+    weights = [FIRST_COLUMN_WEIGHT] + [1.0] * (len(columns) - 1)
+    total_weight = sum(weights)
+    col_widths = [(table_width / total_weight) * w for w in weights]
+
+    col_positions = []
+    cx = TABLE_MARGIN
+    for ci, (key, header, fmt_fn, align) in enumerate(columns):
+        if align == 'right':
+            col_positions.append((cx + col_widths[ci] - 10,))
+        else:
+            col_positions.append((cx,))
+        cx += col_widths[ci]
+    return tuple(col_positions)
+
+
+# Left-of-table anchors, as offsets from the first data column's x
+PACE_DOT_OFFSET = 100
+SPLIT_NUM_OFFSET = 80
+DIVIDER_OFFSET = 90
+
+
+def table_anchors(col_positions):
+    """Return the (pace_dot_x, split_num_x, divider_x) anchors for a table layout."""
+    first_x = col_positions[0][0]
+    return first_x - PACE_DOT_OFFSET, first_x - SPLIT_NUM_OFFSET, first_x - DIVIDER_OFFSET
 
 
 def draw_table_header(ctx, columns, col_positions, y, width):
     """Draw column headers for the data table (raised from 24px to 40px)."""
+    _, num_x, divider_x = table_anchors(col_positions)
+
     # #N header
     draw_text(ctx, "#", "IBM Plex Sans", 40,
-              col_positions[0][0] - 80, y, TEXT_MUTED, weight='SemiBold', align='left')
+              num_x, y, TEXT_MUTED, weight='SemiBold', align='left')
 
     for i, (key, header, fmt_fn, align) in enumerate(columns):
         x = col_positions[i][0]
@@ -485,71 +719,69 @@ def draw_table_header(ctx, columns, col_positions, y, width):
                   x, y, TEXT_MUTED, weight='SemiBold', align=align)
 
     # Subtle divider line below headers
-    ctx.set_source_rgba(*TEXT_MUTED, 0.2)
-    ctx.rectangle(col_positions[0][0] - 90, y + 38, width - 2 * (col_positions[0][0] - 90), 1)
+    ctx.set_source(solid_pattern(TEXT_MUTED, 0.2))
+    ctx.rectangle(divider_x, y + 38, width - 2 * divider_x, 1)
     ctx.fill()
 
     return y + 52
 
 
-def draw_data_row(ctx, split, i, data, columns, col_positions, pace_devs, y):
-    """Draw a single data row (interval or split). Returns new y position."""
-    return draw_data_row_dynamic(ctx, split, i, data, columns, col_positions, pace_devs, y, 30, 66)
+# Data column text styles: (color, weight, size_adjust)
+FIRST_COLUMN_STYLE = (TEXT_PRIMARY, 'Bold', 2)  # First column always white bold
+COLUMN_STYLES = {
+    'watts': (GOLD, 'SemiBold', 0),
+    'hr': (ROSE, 'SemiBold', 0),
+    'rate': (TEAL, 'SemiBold', 0),
+    'pace': (TEXT_PRIMARY, 'Regular', 0),
+}
+DEFAULT_COLUMN_STYLE = (TEXT_SECONDARY, 'Regular', 0)
 
 
-def draw_data_row_dynamic(ctx, split, i, data, columns, col_positions, pace_devs, y, font_size, row_h):
-    """Draw a single data row with dynamic font size, row height, and column-specific colors."""
-    split_num = split.get('splitNumber', i + 1)
+def column_style(ci, key):
+    """Return (color, weight, size_adjust) for a data column by position and type."""
+    if ci == 0:
+        return FIRST_COLUMN_STYLE
+    return COLUMN_STYLES.get(key, DEFAULT_COLUMN_STYLE)
 
-    # Pace dot
-    dev = pace_devs.get(i)
-    if dev is not None:
-        draw_pace_dot(ctx, col_positions[0][0] - 100, y + font_size * 0.5, dev)
+
+def draw_table_rows(ctx, splits, row_ys, columns, col_positions, pace_devs, font_size):
+    """Draw data rows at precomputed y positions, one pass per column,
+    so each column's text style is set once for the whole table.
+    """
+    dot_x, num_x, _ = table_anchors(col_positions)
+    split_nums, *column_cells = format_table_cells(splits, columns)
+
+    # Pace dots, classified up front (splits without a pace get none)
+    dot_classes = pace_dot_classes(pace_devs[:len(row_ys)])
+    draw_pace_dots(ctx, dot_x, [y + font_size * 0.5 for y in row_ys], dot_classes)
 
     # #N
-    draw_text(ctx, f"{split_num}", "IBM Plex Mono", font_size,
-              col_positions[0][0] - 80, y, TEXT_SECONDARY, weight='SemiBold', align='left')
+    for text, y in zip(split_nums, row_ys):
+        draw_text(ctx, text, "IBM Plex Mono", font_size,
+                  num_x, y, TEXT_SECONDARY, weight='SemiBold', align='left')
 
     # Data columns with color coding
-    for ci, (key, header, fmt_fn, align) in enumerate(columns):
+    for ci, ((key, header, fmt_fn, align), cells) in enumerate(zip(columns, column_cells)):
         x = col_positions[ci][0]
-        val = fmt_fn(split)
-
-        # Determine color based on column type
-        if ci == 0:
-            # First column always white bold
-            color = TEXT_PRIMARY
-            weight = 'Bold'
-            size_adjust = 2
-        elif key == 'watts':
-            color = GOLD
-            weight = 'SemiBold'
-            size_adjust = 0
-        elif key == 'hr':
-            color = ROSE
-            weight = 'SemiBold'
-            size_adjust = 0
-        elif key == 'rate':
-            color = TEAL
-            weight = 'SemiBold'
-            size_adjust = 0
-        elif key == 'pace':
-            color = TEXT_PRIMARY
-            weight = 'Regular'
-            size_adjust = 0
-        else:
-            color = TEXT_SECONDARY
-            weight = 'Regular'
-            size_adjust = 0
+        color, weight, size_adjust = column_style(ci, key)
+        for text, y in zip(cells, row_ys):
+            draw_text(ctx, text, "IBM Plex Mono", font_size + size_adjust,
+                      x, y, color, weight=weight, align=align)
 
-        draw_text(ctx, val, "IBM Plex Mono", font_size + size_adjust,
-                  x, y, color, weight=weight, align=align)
 
-    return y + row_h
+def format_table_cells(splits, columns):
+    """Format every table cell up front, column by column.
+    Returns per-column string lists: split numbers first, then one per column.
+    Column formatters are memoized, so repeated values are dict lookups.
+    """
+    cells = [[_int_str(split.get('splitNumber', i + 1)) for i, split in enumerate(splits)]]
+    for _, _, fmt_fn, _ in columns:
+        cells.append([fmt_fn(split) for split in splits])
+    return cells
 
 
-def draw_rest_row(ctx, split, col_positions, width, y):
-    """Draw a rest row with recovery data (raised font from 22px to 32px, TEAL color). Returns new y position."""
+def rest_row_text(split):
+    """Build the recovery line for a rest row, or None when there is nothing to show."""
     rest_time = split.get('restTime')
     rest_hr = split.get('heartRateRest')
     rest_dist = split.get('restDistance')
@@ -562,32 +794,37 @@ def draw_rest_row(ctx, split, col_positions, width, y):
     if rest_hr:
         parts.append(f"HR {rest_hr}")
         hr_ending = split.get('heartRateEnding')
-        if hr_ending and rest_hr:
+        if hr_ending:
             delta = hr_ending - rest_hr
             if delta > 0:
                 parts.append(f"(\u2193{delta})")
 
-    if not parts:
-        return y + 8
-
-    left_edge = col_positions[0][0] - 80
-    draw_text(ctx, "  ".join(parts), "IBM Plex Sans", 32,
-              left_edge, y, TEAL, weight='Regular', align='left')
-    return y + 44
+    return "  ".join(parts) if parts else None
 
 
 # ─────────────────────────────────────────────
 # Main Renderer
 # ─────────────────────────────────────────────
 
-def render_erg_summary_alt(format_key, workout_data, options):
+# Overlays drawn at each fidelity level ('fidelity' option). Unknown levels
+# render as 'full', the same way an unknown 'quality' falls back to the default.
+FIDELITY_LEVELS = ('full', 'medium', 'thumb')
+FIDELITY_WAVES = {'full', 'medium'}
+FIDELITY_DECOR = {'full'}  # Corner radial glow and grain
+THUMB_MAX_SCALE = 0.5
+
+
+@layer_cache(maxsize=2)
+def _background_layer(format_key, scale, waves):
+    """Pre-render the full-bleed background, which is the same for every card
+    of a format: diagonal gradient, warm glow behind the data and wave pattern.
+    The default-scale, full-fidelity layers are pinned while preloading
+    (pin_default_layers); a worker keeps two other (scale, waves) variants of
+    its own, enough for a thumb preview next to a medium one.
+    """
     width, height = DIMENSIONS[format_key]
-    is_story = format_key == '9:16'
+    surface, ctx = create_layer(width, height, scale)
 
-    surface, ctx = setup_canvas(width, height)
-
-    # ── Background ──
-    import cairocffi as cairo
     gradient = cairo.LinearGradient(0, 0, width, height)
     gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
     gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
@@ -603,7 +840,61 @@ def render_erg_summary_alt(format_key, workout_data, options):
     ctx.set_source(radial_bg)
     ctx.paint()
 
-    draw_wave_pattern(ctx, width, height, GOLD, opacity=0.06)
+    if waves:
+        draw_wave_pattern(ctx, width, height, GOLD, opacity=0.06)
+
+    surface.flush()
+    return surface
+
+
+CORNER_GLOW_RADIUS = 300
+CORNER_GLOW_INSET = 200  # Glow centre, from the bottom-right corner
+
+
+@lru_cache(maxsize=8)
+def _corner_glow_layer(scale):
+    """Bottom-right rose glow, pre-rendered once per scale as a small disc layer
+    (the gradient is the same for every format, only its position differs).
+    Blitted over the content, so no gradient is evaluated per render.
+    """
+    r = CORNER_GLOW_RADIUS
+    surface, ctx = create_layer(2 * r, 2 * r, scale)
+    radial = cairo.RadialGradient(r, r, 0, r, r, r)
+    radial.add_color_stop_rgba(0, *ROSE, 0.08)
+    radial.add_color_stop_rgba(1, *ROSE, 0)
+    ctx.set_source(radial)
+    ctx.arc(r, r, r, 0, math.tau)
+    ctx.fill()
+    surface.flush()
+    return surface
+
+
+def pin_default_layers():
+    """Render the default-scale background of every format, to be shared by forked workers"""
+    for format_key in DIMENSIONS:
+        _background_layer.pin(format_key, DEFAULT_RENDER_SCALE, True)
+
+
+def render_erg_summary_alt(format_key, workout_data, options):
+    """Render Design B for one format.
+    Each format is drawn on its own: a 1:1 card is not cropped from the 9:16 one,
+    because its table rows, background gradient and name/branding positions are
+    all sized to its own height.
+    """
+    width, height = DIMENSIONS[format_key]
+    is_story = format_key == '9:16'
+
+    # Previews ('medium', 'thumb') skip the decorative overlays
+    fidelity = options.get('fidelity', 'full')
+    if fidelity not in FIDELITY_LEVELS:
+        fidelity = 'full'
+    scale = render_scale(options)
+    if fidelity == 'thumb':
+        scale = min(scale, THUMB_MAX_SCALE)
+    surface, ctx = setup_canvas(width, height, scale)
+
+    # ── Background (gradient, glow and waves, cached per format) ──
+    blit_surface(ctx, _background_layer(format_key, scale, fidelity in FIDELITY_WAVES))
 
     # ── Extract data ──
     splits = workout_data.get('splits', [])
@@ -617,29 +908,22 @@ def render_erg_summary_alt(format_key, workout_data, options):
     intervals = is_interval(workout_data)
     avg_pace_tenths = workout_data.get('avgPaceTenths')
 
-    _, pace_devs = compute_pace_stats(splits)
-
     # ── Date + Machine Label ──
     date_str = format_date(workout_data.get('date', ''))
-    mlabel = machine_label(workout_data)
+    machine = machine_context(workout_data)
+    bike = machine['bike']
+    mlabel = machine['machine_label']
     draw_text(ctx, date_str, "IBM Plex Sans", 36,
               120, 140, TEXT_MUTED, weight='Regular', align='left')
     draw_text(ctx, mlabel, "IBM Plex Sans", 36,
               width - 120, 140, TEXT_MUTED, weight='SemiBold', align='right')
 
     # ── Hero: Workout Title (no machine type) ──
-    title = build_title(workout_data)
+    summary = summarize_splits(splits)
+    title = build_title(workout_data, summary)
 
     # Auto-size based on title length (raised minimum from 80px to 100px)
-    title_len = len(title)
-    if title_len <= 12:
-        hero_font_size = 200
-    elif title_len <= 18:
-        hero_font_size = 160
-    elif title_len <= 24:
-        hero_font_size = 120
-    else:
-        hero_font_size = 100
+    hero_font_size = TITLE_FONT_SIZES[bisect_left(TITLE_LENGTH_TIERS, len(title))]
 
     # Calculate hero section dimensions for panel background
     hero_y = 300
@@ -650,7 +934,7 @@ def render_erg_summary_alt(format_key, workout_data, options):
     panel_y = hero_y - 60
     panel_height = metrics_y - panel_y + 320  # Covers hero + summary stats
     draw_rounded_rect(ctx, panel_padding, panel_y, width - 2 * panel_padding, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.3)
+    ctx.set_source(solid_pattern(SLATE, 0.3))
     ctx.fill()
 
     # Draw hero title
@@ -658,18 +942,18 @@ def render_erg_summary_alt(format_key, workout_data, options):
               width / 2, hero_y, TEXT_PRIMARY, weight='Bold', align='center')
 
     # ── Secondary Metrics — 2x2 grid ──
-    rl = rate_label(workout_data)
+    rl = machine['rate_label']
 
     # Build 4 summary stats — hero metric first, then complementary stats
     stats = []
-    hero_value, hero_label = get_hero(workout_data)
+    hero_value, hero_label = get_hero(workout_data, machine)
     hero_is_watts = 'WATTS' in hero_label.upper()
     stats.append((hero_value, hero_label))
 
     if not hero_is_watts and avg_watts is not None:
         stats.append((str(avg_watts), "WATTS"))
     elif hero_is_watts and avg_pace_tenths:
-        stats.append((format_pace(avg_pace_tenths, workout_data), f"AVG PACE {pace_unit(workout_data)}"))
+        stats.append((format_pace(avg_pace_tenths, bike), f"AVG PACE {machine['pace_unit']}"))
     elif duration_sec:
         stats.append((format_time_clean(duration_sec), "TOTAL TIME"))
 
@@ -691,14 +975,15 @@ def render_erg_summary_alt(format_key, workout_data, options):
     else:
         positions = [(240 + i * 480, metrics_y, 'left') for i in range(len(stats))]
 
-    for i, (val, lbl) in enumerate(stats[:4]):
-        if i < len(positions):
-            x, y, align = positions[i]
-            color = GOLD if i % 2 == 0 else ROSE
-            draw_text(ctx, val, "IBM Plex Mono", stat_font,
-                      x, y, color, weight='Bold', align=align)
-            draw_text(ctx, lbl, "IBM Plex Sans", 36,
-                      x, y + 90, TEXT_MUTED, weight='SemiBold', align=align)
+    # One pass per text style: all values, then all labels
+    placed = list(zip(stats[:4], positions))
+    for i, ((val, _), (x, y, align)) in enumerate(placed):
+        color = GOLD if i % 2 == 0 else ROSE
+        draw_text(ctx, val, "IBM Plex Mono", stat_font,
+                  x, y, color, weight='Bold', align=align)
+    for (_, lbl), (x, y, align) in placed:
+        draw_text(ctx, lbl, "IBM Plex Sans", 36,
+                  x, y + 90, TEXT_MUTED, weight='SemiBold', align=align)
 
     # ── Splits / Intervals Table or Extended Summary ──
     if splits:
@@ -713,7 +998,8 @@ def render_erg_summary_alt(format_key, workout_data, options):
 
         # Detect short workouts (1-3 splits, JustRow or FixedTimeSplits)
         wtype = workout_data.get('workoutType', '')
-        is_short_workout = len(splits) <= 3 and wtype in ('JustRow', 'FixedTimeSplits')
+        n_splits = len(splits)
+        is_short_workout = n_splits <= 3 and wtype in SHORT_SUMMARY_TYPES
 
         if is_short_workout:
             # Extended summary layout for short workouts (no table)
@@ -724,15 +1010,15 @@ def render_erg_summary_alt(format_key, workout_data, options):
             # 6-8 stat summary in 2-column grid
             extended_stats = []
             if distance_m:
-                extended_stats.append(("Total Distance", f"{distance_m:,}m"))
+                extended_stats.append(("Total Distance", format_meters(distance_m)))
             if duration_sec:
                 extended_stats.append(("Total Time", format_time_clean(duration_sec)))
             if avg_pace_tenths:
-                extended_stats.append(("Avg Pace", f"{format_pace(avg_pace_tenths, workout_data)} {pace_unit(workout_data)}"))
+                extended_stats.append(("Avg Pace", f"{format_pace(avg_pace_tenths, bike)} {machine['pace_unit']}"))
             if avg_watts:
                 extended_stats.append(("Avg Watts", str(avg_watts)))
             if stroke_rate:
-                extended_stats.append(("Avg " + rate_label(workout_data), str(stroke_rate)))
+                extended_stats.append(("Avg " + rl, str(stroke_rate)))
             if avg_hr:
                 extended_stats.append(("Avg Heart Rate", str(avg_hr)))
             if calories:
@@ -747,23 +1033,28 @@ def render_erg_summary_alt(format_key, workout_data, options):
             left_x = 300
             right_x = width - 300
 
+            # Cell positions first, then one pass per text style
+            cells = []
             for i, (label, value) in enumerate(extended_stats):
                 if i % 2 == 0:
                     x, align = left_x, 'left'
                 else:
                     x, align = right_x, 'right'
-
-                draw_text(ctx, value, "IBM Plex Mono", 64,
-                          x, col_y, GOLD if i % 4 < 2 else ROSE, weight='Bold', align=align)
-                draw_text(ctx, label, "IBM Plex Sans", 36,
-                          x, col_y + 80, TEXT_SECONDARY, weight='SemiBold', align=align)
+                cells.append((label, value, x, col_y, align, GOLD if i % 4 < 2 else ROSE))
 
                 if i % 2 == 1:
                     col_y += row_height
 
+            for label, value, x, y, align, color in cells:
+                draw_text(ctx, value, "IBM Plex Mono", 64,
+                          x, y, color, weight='Bold', align=align)
+            for label, value, x, y, align, color in cells:
+                draw_text(ctx, label, "IBM Plex Sans", 36,
+                          x, y + 80, TEXT_SECONDARY, weight='SemiBold', align=align)
+
             # Optional: inline splits as descriptive line
-            if len(splits) > 1:
-                splits_text = "Splits: " + " | ".join([format_pace(s.get('paceTenths'), workout_data) for s in splits if s.get('paceTenths')])
+            if n_splits > 1:
+                splits_text = "Splits: " + " | ".join([format_pace(s.get('paceTenths'), bike) for s in splits if s.get('paceTenths')])
                 col_y += 60
                 draw_text(ctx, splits_text, "IBM Plex Mono", 40,
                           width / 2, col_y, TEXT_MUTED, weight='Regular', align='center')
@@ -771,34 +1062,17 @@ def render_erg_summary_alt(format_key, workout_data, options):
         else:
             # Standard table layout for longer workouts
             # Section header with pattern description (raised from 30px to 40px)
-            header_text = build_table_header(workout_data, splits)
+            header_text = build_table_header(workout_data, splits, summary)
             header_y = table_start_y + 50
             draw_text(ctx, header_text, "IBM Plex Sans", 40,
                       width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center')
 
             # Decide rest row strategy for intervals
-            uniform_rest, uniform_rest_val = has_uniform_rest(splits)
-            show_rest_rows = intervals and (not uniform_rest or has_valuable_rest_data(splits))
+            show_rest_rows = intervals and (not summary.rest_uniform or summary.has_recovery_hr)
 
             # Set up column positions with symmetric margins and near-equal widths
-            columns = get_table_columns(workout_data)
-            margin = 160  # Symmetric margins (was asymmetric 140)
-            table_width = width - 2 * margin
-            n_cols = len(columns)
-
-            # Near-equal width distribution: first column gets 1.3x weight, others get 1x
-            weights = [1.3] + [1.0] * (n_cols - 1)
-            total_weight = sum(weights)
-            col_widths = [(table_width / total_weight) * w for w in weights]
-
-            col_positions = []
-            cx = margin
-            for ci, (key, header, fmt_fn, align) in enumerate(columns):
-                if align == 'right':
-                    col_positions.append((cx + col_widths[ci] - 10,))
-                else:
-                    col_positions.append((cx,))
-                cx += col_widths[ci]
+            columns = get_table_columns(workout_data, machine)
+            col_positions = table_column_positions(columns, width)
 
             # Column headers
             col_header_y = header_y + 60
@@ -809,7 +1083,7 @@ def render_erg_summary_alt(format_key, workout_data, options):
             avail_height = height - cy - branding_reserve
 
             # Estimate total rows needed (data rows + rest rows)
-            n_data_rows = len(splits)
+            n_data_rows = n_splits
             n_rest_rows = 0
             if intervals and show_rest_rows:
                 n_rest_rows = max(0, n_data_rows - 1)  # no rest after last
@@ -832,27 +1106,44 @@ def render_erg_summary_alt(format_key, workout_data, options):
             total_h = n_data_rows * data_row_h + n_rest_rows * rest_row_h
             if total_h > avail_height:
                 # Too many rows — shrink to fit or truncate (raised minimums)
-                scale = avail_height / total_h
-                data_row_h = max(60, int(data_row_h * scale))
-                rest_row_h = max(32, int(rest_row_h * scale))
-                data_font = max(44, int(data_font * scale))
+                fit = avail_height / total_h
+                data_row_h = max(60, int(data_row_h * fit))
+                rest_row_h = max(32, int(rest_row_h * fit))
+                data_font = max(44, int(data_font * fit))
 
             max_rows = max(1, int(avail_height / (data_row_h + (rest_row_h if show_rest_rows else 8))))
-            show = splits[:max_rows]
-            truncated = len(splits) > max_rows
+            truncated = n_splits > max_rows
+            show = splits[:max_rows] if truncated else splits
 
-            is_last_interval_in_workout = lambda idx: idx == len(splits) - 1
+            # Lay out every row first, then draw the table column by column
+            is_last_interval_in_workout = lambda idx: idx == n_splits - 1
+            row_ys = []
+            rest_rows = []
             for i, s in enumerate(show):
-                cy = draw_data_row_dynamic(ctx, s, i, workout_data, columns, col_positions,
-                                           pace_devs, cy, data_font, data_row_h)
+                row_ys.append(cy)
+                cy += data_row_h
                 if intervals and show_rest_rows and not is_last_interval_in_workout(i):
-                    cy = draw_rest_row(ctx, s, col_positions, width, cy)
+                    rest_text = rest_row_text(s)
+                    if rest_text is None:
+                        cy += 8
+                    else:
+                        rest_rows.append((rest_text, cy))
+                        cy += 44
                     cy += rest_row_h - 44  # adjust for rest_row's own 44px
                 elif intervals:
                     cy += max(4, data_row_h - data_font * 2)
 
+            # Pace dots only appear in the table, so deviations are computed here
+            _, pace_devs = compute_pace_stats(splits)
+            draw_table_rows(ctx, show, row_ys, columns, col_positions, pace_devs, data_font)
+
+            _, rest_x, _ = table_anchors(col_positions)
+            for rest_text, rest_y in rest_rows:
+                draw_text(ctx, rest_text, "IBM Plex Sans", 32,
+                          rest_x, rest_y, TEAL, weight='Regular', align='left')
+
             if truncated:
-                remaining = len(splits) - max_rows
+                remaining = n_splits - max_rows
                 word = "interval" if intervals else "split"
                 draw_text(ctx, f"+ {remaining} more {word}{'s' if remaining != 1 else ''}",
                           "IBM Plex Sans", 36,
@@ -869,23 +1160,24 @@ def render_erg_summary_alt(format_key, workout_data, options):
         name_y = height - 200
         nw, nh = draw_text(ctx, name, "IBM Plex Sans", 54,
                            width / 2, name_y, TEXT_SECONDARY, weight='SemiBold', align='center')
-        ctx.set_source_rgba(*GOLD, 0.4)
+        ctx.set_source(solid_pattern(GOLD, 0.4))
         ctx.rectangle((width - nw - 40) / 2, name_y + nh + 20, nw + 40, 3)
         ctx.fill()
 
     # ── Decorative Elements ──
-    radial = cairo.RadialGradient(width - 200, height - 200, 0, width - 200, height - 200, 300)
-    radial.add_color_stop_rgba(0, *ROSE, 0.08)
-    radial.add_color_stop_rgba(1, *ROSE, 0)
-    ctx.set_source(radial)
-    ctx.arc(width - 200, height - 200, 300, 0, 2 * math.pi)
-    ctx.fill()
-
-    ctx.set_source_rgba(*GOLD, 0.3)
-    ctx.arc(width - 140, 100, 40, 0, 2 * math.pi)
+    if fidelity in FIDELITY_DECOR:
+        # Whole device pixels, so the layer is copied without resampling
+        glow_offset = CORNER_GLOW_INSET + CORNER_GLOW_RADIUS
+        gx, gy = ctx.user_to_device(width - glow_offset, height - glow_offset)
+        blit_surface(ctx, _corner_glow_layer(scale), round(gx), round(gy))
+
+    ctx.set_source(solid_pattern(GOLD, 0.3))
+    ctx.arc(width - 140, 100, 40, 0, math.tau)
     ctx.fill()
 
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    if fidelity in FIDELITY_DECOR:
+        draw_grain_texture(ctx, width, height, opacity=0.03)
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
+
@@ -0,0 +1,45 @@
+"""
+Grain noise generation for share card textures
+Produces the per-pixel alpha plane used by draw_grain_texture, as vectorized
+NumPy. Grain is generated once per opacity as a small repeating tile (see
+base_template.grain_mask), so there is no hot loop left to compile.
+"""
+
+import os
+
+import numpy as np
+
+# Grain is drawn in square blocks of this many pixels
+BLOCK_SIZE = 4
+
+
+def reseed():
+    """
+    Give this process its own grain noise sequence
+
+    Forked processes inherit NumPy's global random state, so without this every
+    gunicorn / batch-pool worker would draw the same noise.
+    """
+    np.random.seed(int.from_bytes(os.urandom(4), 'little'))
+
+
+def make_grain(width, height, opacity):
+    """
+    Generate a grain alpha plane: one random value per block, repeated
+
+    Args:
+        width, height: Plane size in pixels
+        opacity: Maximum grain opacity (0-1)
+
+    Returns: uint8 array of shape (height, width), 0-255 alpha per pixel
+    """
+    blocks_y = (height + BLOCK_SIZE - 1) // BLOCK_SIZE
+    blocks_x = (width + BLOCK_SIZE - 1) // BLOCK_SIZE
+    noise = np.random.random_sample((blocks_y, blocks_x)) * (opacity * 255)
+    alpha = noise.round().astype(np.uint8)
+    alpha = np.repeat(np.repeat(alpha, BLOCK_SIZE, axis=0), BLOCK_SIZE, axis=1)
+    return np.ascontiguousarray(alpha[:height, :width])
+
+
+# Reseed in every forked child (gunicorn workers, batch pool processes)
+os.register_at_fork(after_in_child=reseed)
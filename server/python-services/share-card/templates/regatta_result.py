@@ -10,18 +10,14 @@ Placement badge styling:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
-    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
+    setup_canvas, render_scale, draw_text, draw_gradient_rect, draw_rounded_rect,
+    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes, solid_pattern,
+    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE,
+    DIMENSIONS
 )
 from datetime import datetime
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def format_date(iso_date):
     """Format ISO date string to readable format"""
@@ -99,7 +95,7 @@ def render_regatta_result(format_key, workout_data, options):
     width, height = DIMENSIONS[format_key]
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
+    surface, ctx = setup_canvas(width, height, render_scale(options))
 
     # Background - dark with subtle gradient
     gradient = cairo.LinearGradient(0, 0, width, height)
@@ -158,7 +154,7 @@ def render_regatta_result(format_key, workout_data, options):
     panel_height = 280
 
     draw_rounded_rect(ctx, panel_padding, y, panel_width, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.4)
+    ctx.set_source(solid_pattern(SLATE, 0.4))
     ctx.fill()
 
     # Time value
@@ -237,7 +233,7 @@ def render_regatta_result(format_key, workout_data, options):
     # Branding
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
 
 
 # Sample data for testing
@@ -9,18 +9,14 @@ Displays:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
-    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
+    setup_canvas, render_scale, draw_text, draw_gradient_rect, draw_rounded_rect,
+    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes, solid_pattern,
+    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE,
+    DIMENSIONS
 )
 from datetime import datetime
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def format_date(iso_date):
     """Format ISO date string to readable format"""
@@ -59,7 +55,7 @@ def draw_result_row(ctx, race, y, width, row_height, is_alt_row):
     """Draw a single result row with alternating background"""
     # Alternating row background
     if is_alt_row:
-        ctx.set_source_rgba(*SLATE, 0.2)
+        ctx.set_source(solid_pattern(SLATE, 0.2))
         ctx.rectangle(80, y - 10, width - 160, row_height)
         ctx.fill()
 
@@ -116,7 +112,7 @@ def render_regatta_summary(format_key, workout_data, options):
     width, height = DIMENSIONS[format_key]
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
+    surface, ctx = setup_canvas(width, height, render_scale(options))
 
     # Background - dark with subtle gradient
     gradient = cairo.LinearGradient(0, 0, width, height)
@@ -149,7 +145,7 @@ def render_regatta_summary(format_key, workout_data, options):
 
     # Decorative separator
     separator_width = 600
-    ctx.set_source_rgba(*COPPER, 0.5)
+    ctx.set_source(solid_pattern(COPPER, 0.5))
     ctx.rectangle((width - separator_width) / 2, y, separator_width, 3)
     ctx.fill()
     y += 80
@@ -211,7 +207,7 @@ def render_regatta_summary(format_key, workout_data, options):
     panel_height = 280
 
     draw_rounded_rect(ctx, panel_padding, y, panel_width, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.3)
+    ctx.set_source(solid_pattern(SLATE, 0.3))
     ctx.fill()
 
     # Stats in 3-column grid
@@ -245,7 +241,7 @@ def render_regatta_summary(format_key, workout_data, options):
     # Branding
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
 
 
 # Sample data for testing
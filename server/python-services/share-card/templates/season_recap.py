@@ -11,17 +11,13 @@ Layout:
 
 import math
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
-    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
+    setup_canvas, render_scale, draw_text, draw_gradient_rect, draw_rounded_rect,
+    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes, solid_pattern,
+    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE,
+    DIMENSIONS
 )
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def format_meters(meters):
     """Format meters with comma separators and unit"""
@@ -73,7 +69,7 @@ def draw_celebration_background(ctx, width, height):
 
     # Abstract wave patterns
     ctx.save()
-    ctx.set_source_rgba(*COPPER, 0.08)
+    ctx.set_source(solid_pattern(COPPER, 0.08))
     ctx.set_line_width(4)
     for i in range(6):
         y_base = height * 0.15 + (i * height * 0.14)
@@ -155,7 +151,7 @@ def render_season_recap(format_key, workout_data, options):
     width, height = DIMENSIONS[format_key]
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
+    surface, ctx = setup_canvas(width, height, render_scale(options))
 
     # Celebration background
     draw_celebration_background(ctx, width, height)
@@ -265,7 +261,7 @@ def render_season_recap(format_key, workout_data, options):
         panel_x = (width - panel_width) / 2
 
         draw_rounded_rect(ctx, panel_x, y, panel_width, panel_height, 24)
-        ctx.set_source_rgba(*GOLD, 0.15)
+        ctx.set_source(solid_pattern(GOLD, 0.15))
         ctx.fill()
 
         # PRs count with badge
@@ -310,7 +306,7 @@ def render_season_recap(format_key, workout_data, options):
     # Branding
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
 
 
 # Sample data for testing
@@ -10,17 +10,13 @@ Layout:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
+    setup_canvas, render_scale, draw_text, draw_gradient_rect, draw_rounded_rect,
     draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
-    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
+    DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE,
+    DIMENSIONS
 )
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def get_rank_color(rank):
     """Return color for rank position"""
@@ -128,7 +124,7 @@ def render_team_leaderboard(format_key, workout_data, options):
     width, height = DIMENSIONS[format_key]
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
+    surface, ctx = setup_canvas(width, height, render_scale(options))
 
     # Background - dark with team pride gradient
     gradient = cairo.LinearGradient(0, 0, width, height)
@@ -225,7 +221,7 @@ def render_team_leaderboard(format_key, workout_data, options):
     # Branding
     draw_oarbit_branding(ctx, width, height, format_key, options)
 
-    return surface_to_png_bytes(surface)
+    return surface_to_png_bytes(surface, options)
 
 
 # Sample data for testing
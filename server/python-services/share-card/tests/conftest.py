@@ -0,0 +1,13 @@
+"""
+Shared pytest setup for the share card service
+
+Run from server/python-services/share-card, after
+pip install -r requirements-dev.txt:  python -m pytest tests
+(needs the Cairo/Pango system libraries, as in the Dockerfile)
+"""
+
+import os
+import sys
+
+# Make app.py and the templates package importable without installing anything
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
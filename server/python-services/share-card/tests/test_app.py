@@ -0,0 +1,182 @@
+"""
+Tests for request decoding and the PNG cache in app.py
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+import app as share_app
+from app import MAX_BATCH_SIZE, BatchCardRequest, CardRequest, decode_request
+
+
+FAKE_PNG = b'\x89PNG\r\n\x1a\nfake'
+
+
+def encode(body):
+    return json.dumps(body).encode('utf-8')
+
+
+# ─────────────────────────────────────────────
+# decode_request
+# ─────────────────────────────────────────────
+
+def test_decode_request_defaults():
+    card, error = decode_request(encode({'cardType': 'erg_summary'}), CardRequest)
+    assert error is None
+    assert card.cardType == 'erg_summary'
+    assert card.format == '1:1'
+    assert card.workoutData == {}
+    assert card.options.to_dict() == {}
+
+
+def test_decode_request_keeps_given_options_only():
+    card, error = decode_request(encode({
+        'cardType': 'erg_summary_alt',
+        'format': '9:16',
+        'options': {'showName': False, 'pngLevel': 6, 'teamColor': None, 'unknownKey': 1},
+    }), CardRequest)
+    assert error is None
+    assert card.format == '9:16'
+    assert card.options.to_dict() == {'showName': False, 'pngLevel': 6, 'teamColor': None}
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'', 'Missing request body'),
+    (b'{"cardType": ', 'Malformed JSON request body'),
+    (b'not json', 'Malformed JSON request body'),
+])
+def test_decode_request_unreadable_body(body, message):
+    card, error = decode_request(body, CardRequest)
+    assert card is None
+    assert error == ({'error': message}, 400)
+
+
+@pytest.mark.parametrize('body', [
+    [],
+    {},
+    {'cardType': ''},
+    {'cardType': 'test', 'format': '4:3'},
+    {'cardType': 'test', 'workoutData': []},
+    {'cardType': 'test', 'options': []},
+    {'cardType': 'test', 'options': {'showName': 'yes'}},
+    {'cardType': 'test', 'options': {'pngLevel': 10}},
+    {'cardType': 'test', 'options': {'pngLevel': -1}},
+    {'cardType': 'test', 'options': {'athleteName': 7}},
+])
+def test_decode_request_invalid_card(body):
+    card, error = decode_request(encode(body), CardRequest)
+    assert card is None
+    body, status = error
+    assert status == 400
+    assert body['error'].startswith('Invalid request: ')
+
+
+@pytest.mark.parametrize('n_cards', [0, MAX_BATCH_SIZE + 1])
+def test_decode_request_batch_size_limits(n_cards):
+    cards = [{'cardType': 'test'}] * n_cards
+    batch, error = decode_request(encode({'cards': cards}), BatchCardRequest)
+    assert batch is None
+    assert error[1] == 400
+
+
+def test_decode_request_batch():
+    cards = [{'cardType': 'test'}, {'cardType': 'erg_summary', 'format': '9:16'}]
+    batch, error = decode_request(encode({'cards': cards}), BatchCardRequest)
+    assert error is None
+    assert [(c.cardType, c.format) for c in batch.cards] == [('test', '1:1'), ('erg_summary', '9:16')]
+
+
+# ─────────────────────────────────────────────
+# PNG cache (/generate, /generate_batch)
+# ─────────────────────────────────────────────
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with an empty memory-only cache and a counting fake renderer"""
+    calls = []
+
+    def fake_renderer(format_key, workout_data, options):
+        calls.append((format_key, workout_data, options))
+        return FAKE_PNG
+
+    monkeypatch.setitem(share_app.CARD_RENDERERS, 'fake', fake_renderer)
+    monkeypatch.setattr(share_app, 'CARD_CACHE_DIR', None)
+    monkeypatch.setattr(share_app, 'CARD_CACHE_SIZE', 32)
+    monkeypatch.setattr(share_app, 'BATCH_WORKERS', 1)
+    share_app._card_cache.clear()
+
+    client = share_app.app.test_client()
+    client.render_calls = calls
+    yield client
+    share_app._card_cache.clear()
+
+
+def post_card(client, **card):
+    return client.post('/generate', data=encode({'cardType': 'fake', **card}))
+
+
+def test_generate_miss_then_hit(client):
+    first = post_card(client, workoutData={'distanceM': 2000})
+    second = post_card(client, workoutData={'distanceM': 2000})
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data == FAKE_PNG
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert len(client.render_calls) == 1
+
+
+def test_generate_cache_key_covers_format_data_and_options(client):
+    post_card(client, workoutData={'distanceM': 2000})
+    variants = [
+        post_card(client, format='9:16', workoutData={'distanceM': 2000}),
+        post_card(client, workoutData={'distanceM': 5000}),
+        post_card(client, workoutData={'distanceM': 2000}, options={'showName': False}),
+    ]
+    assert [r.headers['X-Cache'] for r in variants] == ['MISS', 'MISS', 'MISS']
+    assert len(client.render_calls) == 4
+
+
+def test_generate_cache_bypass(client):
+    options = {'cacheBypass': True}
+    responses = [post_card(client, options=options) for _ in range(2)]
+    assert [r.headers['X-Cache'] for r in responses] == ['MISS', 'MISS']
+    assert len(client.render_calls) == 2
+
+
+def test_generate_cache_evicts_least_recently_used(client, monkeypatch):
+    monkeypatch.setattr(share_app, 'CARD_CACHE_SIZE', 2)
+    for n in (1, 2, 1, 3):  # 2 is the least recently used when 3 is stored
+        post_card(client, workoutData={'n': n})
+
+    assert post_card(client, workoutData={'n': 1}).headers['X-Cache'] == 'HIT'
+    assert post_card(client, workoutData={'n': 2}).headers['X-Cache'] == 'MISS'
+
+
+def test_generate_rejects_unknown_card_type(client):
+    response = client.post('/generate', data=encode({'cardType': 'no_such_card'}))
+    assert response.status_code == 400
+    assert 'fake' in response.get_json()['supported']
+
+
+def test_generate_batch_counts_cache_hits(client):
+    post_card(client, workoutData={'n': 1})
+    cards = [{'cardType': 'fake', 'workoutData': {'n': n}} for n in (1, 2, 2)]
+    response = client.post('/generate_batch', data=encode({'cards': cards}))
+
+    assert response.status_code == 200
+    # Card 2 is rendered once per occurrence - the cache is only read up front
+    assert response.headers['X-Cache-Hits'] == '1'
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        assert zf.namelist() == ['00-fake-1x1.png', '01-fake-1x1.png', '02-fake-1x1.png']
+        assert all(zf.read(name) == FAKE_PNG for name in zf.namelist())
+
+
+def test_generate_batch_reports_bad_card_index(client):
+    cards = [{'cardType': 'fake'}, {'cardType': 'no_such_card'}]
+    response = client.post('/generate_batch', data=encode({'cards': cards}))
+    assert response.status_code == 400
+    assert response.get_json()['index'] == 1
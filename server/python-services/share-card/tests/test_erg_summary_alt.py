@@ -0,0 +1,131 @@
+"""
+Tests for the Design B formatters and split summary
+
+Expected strings are the output of the original (pre-memoization) formatters,
+so a faster implementation must keep rendering the same text.
+"""
+
+import pytest
+
+from templates.erg_summary_alt import (
+    format_date, format_pace, format_time_clean, machine_context, summarize_splits,
+)
+
+
+@pytest.mark.parametrize('seconds, expected', [
+    (0, '--:--'),
+    (None, '--:--'),
+    (45, '0:45'),
+    (60, '1:00'),
+    (90, '1:30'),
+    (125, '2:05'),
+    (125.0, '2:05'),
+    (382.1, '6:22.1'),
+    (420.3, '7:00.3'),
+    (660, '11:00'),
+    (3600, '1:00:00'),
+    (3661, '1:01:01'),
+    (7325.5, '2:02:05.5'),
+])
+def test_format_time_clean(seconds, expected):
+    assert format_time_clean(seconds) == expected
+
+
+def test_format_time_clean_int_matches_float():
+    for seconds in range(1, 20000, 7):
+        assert format_time_clean(seconds) == format_time_clean(float(seconds))
+
+
+@pytest.mark.parametrize('tenths, bike, expected', [
+    (0, False, '--:--'),
+    (None, True, '--:--'),
+    (600, False, '1:00.0'),
+    (600, True, '2:00.0'),
+    (1050, False, '1:45.0'),
+    (1050, True, '3:30.0'),
+    (1055, False, '1:45.5'),
+    (1055, True, '3:31.0'),
+    (1199, False, '1:59.9'),
+    (1199, True, '3:59.8'),
+    (1055.5, False, '1:45.5'),
+    (1055.5, True, '3:31.1'),
+    (3599, False, '5:59.9'),
+    (3599, True, '11:59.8'),
+])
+def test_format_pace(tenths, bike, expected):
+    assert format_pace(tenths, bike) == expected
+
+
+def test_format_pace_int_matches_float():
+    for tenths in range(1, 20000, 3):
+        for bike in (False, True):
+            assert format_pace(tenths, bike) == format_pace(float(tenths), bike)
+
+
+def test_format_pace_bike_from_machine_context():
+    bike = machine_context({'rawMachineType': 'BikErg'})['bike']
+    assert format_pace(1050, bike) == '3:30.0'
+
+
+@pytest.mark.parametrize('iso_date, expected', [
+    ('2024-03-01T10:00:00Z', 'Mar 01, 2024'),
+    ('2024-03-01', 'Mar 01, 2024'),
+    ('2024-12-25T23:59:59.123+02:00', 'Dec 25, 2024'),
+    ('bad', 'bad'),
+    ('', ''),
+    (None, ''),
+    (20240301, ''),
+    ([], ''),
+])
+def test_format_date(iso_date, expected):
+    assert format_date(iso_date) == expected
+
+
+def test_summarize_splits_empty():
+    summary = summarize_splits([])
+    assert summary.n == 0
+    assert summary.uniform_distance is None
+    assert summary.uniform_time is None
+    assert summary.rest_uniform is True
+    assert summary.uniform_rest is None
+    assert summary.avg_rest is None
+    assert summary.has_recovery_hr is False
+
+
+def test_summarize_splits_uniform_intervals():
+    splits = [
+        {'distanceM': 500, 'timeSeconds': 95.2, 'restTime': 600},
+        {'distanceM': 500, 'timeSeconds': 95.8, 'restTime': 600, 'heartRateRest': 120},
+        {'distanceM': 500, 'timeSeconds': 96.0, 'restTime': 1800},  # Cooldown, not a work rest
+    ]
+    summary = summarize_splits(splits)
+    assert summary.n == 3
+    assert summary.uniform_distance == 500
+    assert summary.uniform_time is None  # 95 vs 96 whole seconds
+    assert summary.rest_uniform is True
+    assert summary.uniform_rest == 600
+    assert summary.avg_rest == 600
+    assert summary.has_recovery_hr is True
+
+
+def test_summarize_splits_varying():
+    splits = [
+        {'distanceM': 500, 'timeSeconds': 240.4, 'restTime': 600},
+        {'distanceM': 1000, 'timeSeconds': 240.9, 'restTime': 300},
+        {'distanceM': 0, 'timeSeconds': 240.0},
+    ]
+    summary = summarize_splits(splits)
+    assert summary.uniform_distance is None
+    assert summary.uniform_time == 240.4  # Matches to the second
+    assert summary.rest_uniform is False
+    assert summary.uniform_rest is None
+    assert summary.avg_rest == 450
+    assert summary.has_recovery_hr is False
+
+
+def test_summarize_splits_single_split_rest_counts():
+    summary = summarize_splits([{'timeSeconds': 600, 'restTime': 120}])
+    assert summary.n == 1
+    assert summary.uniform_time == 600
+    assert summary.uniform_rest == 120
+    assert summary.avg_rest == 120